@@ -3,10 +3,37 @@ Basic example of using the Simple Agent Framework with OpenAI.
 """
 
 import asyncio
+import functools
+from types import MappingProxyType
+
 from simple_agent import Agent, function_tool
 
+# In a real implementation, this would come from a weather API
+_WEATHER = MappingProxyType({
+    "San Francisco": "Foggy, 60°F",
+    "New York": "Partly cloudy, 72°F",
+    "London": "Rainy, 55°F",
+    "Tokyo": "Sunny, 80°F",
+})
+
+# Simplified conversion rates
+_RATES = MappingProxyType({
+    "USD": 1.0,
+    "EUR": 0.92,
+    "JPY": 153.2,
+    "GBP": 0.79,
+})
+
+# Conversion factor for every (from, to) pair
+_CROSS_RATES = MappingProxyType({
+    (source, target): _RATES[target] / _RATES[source]
+    for source in _RATES
+    for target in _RATES
+})
+
 # Define a simple tool
 @function_tool
+@functools.lru_cache(maxsize=256)
 def get_weather(location: str) -> str:
     """Get the current weather for a location.
     
@@ -16,18 +43,12 @@ def get_weather(location: str) -> str:
     Returns:
         A description of the weather.
     """
-    # In a real implementation, this would call a weather API
-    weather_data = {
-        "San Francisco": "Foggy, 60°F",
-        "New York": "Partly cloudy, 72°F",
-        "London": "Rainy, 55°F",
-        "Tokyo": "Sunny, 80°F",
-    }
-    
-    return weather_data.get(location, f"Weather data not available for {location}")
+    return _WEATHER.get(location, f"Weather data not available for {location}")
 
 # Define another tool for currency conversion
 @function_tool
+# typed, so 100 and 100.0 are cached separately and keep their own formatting
+@functools.lru_cache(maxsize=256, typed=True)
 def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
     """Convert between currencies.
     
@@ -39,22 +60,11 @@ def convert_currency(amount: float, from_currency: str, to_currency: str) -> str
     Returns:
         The converted amount.
     """
-    # Simplified conversion rates
-    rates = {
-        "USD": 1.0,
-        "EUR": 0.92,
-        "JPY": 153.2,
-        "GBP": 0.79,
-    }
-    
-    if from_currency not in rates or to_currency not in rates:
+    factor = _CROSS_RATES.get((from_currency, to_currency))
+    if factor is None:
         return f"Currency not supported: {from_currency} or {to_currency}"
     
-    # Calculate conversion
-    in_usd = amount / rates[from_currency]
-    result = in_usd * rates[to_currency]
-    
-    return f"{amount} {from_currency} = {result:.2f} {to_currency}"
+    return f"{amount} {from_currency} = {amount * factor:.2f} {to_currency}"
 
 # Create an agent with OpenAI
 agent = Agent(
@@ -65,18 +75,32 @@ Be friendly and concise in your responses.""",
     tools=[get_weather, convert_currency]
 )
 
+# Limit how many requests hit the provider at once
+MAX_CONCURRENT_REQUESTS = 3
+
+
+async def run_limited(semaphore: asyncio.Semaphore, query: str):
+    """Run a single query while holding a slot in the semaphore."""
+    async with semaphore:
+        return await agent.arun(query)
+
+
 # Run the agent
 async def main():
-    # Example 1: Weather
-    result1 = await agent.arun("What's the weather like in Tokyo?")
-    print(f"Example 1 Response: {result1}")
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
     
-    # Example 2: Currency conversion
-    result2 = await agent.arun("I need to convert 100 USD to EUR, can you help?")
-    print(f"Example 2 Response: {result2}")
+    # The queries are independent, so run them concurrently
+    result1, result2, result3 = await asyncio.gather(
+        # Example 1: Weather
+        run_limited(semaphore, "What's the weather like in Tokyo?"),
+        # Example 2: Currency conversion
+        run_limited(semaphore, "I need to convert 100 USD to EUR, can you help?"),
+        # Example 3: General knowledge (no tool use)
+        run_limited(semaphore, "What are some famous landmarks in Paris?"),
+    )
     
-    # Example 3: General knowledge (no tool use)
-    result3 = await agent.arun("What are some famous landmarks in Paris?")
+    print(f"Example 1 Response: {result1}")
+    print(f"Example 2 Response: {result2}")
     print(f"Example 3 Response: {result3}")
 
 if __name__ == "__main__":
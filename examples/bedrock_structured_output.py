@@ -3,8 +3,9 @@ Example of using the Simple Agent Framework with AWS Bedrock and structured outp
 """
 
 import asyncio
+from types import MappingProxyType
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from simple_agent import Agent, AgentConfig, BedrockModel, function_tool, pydantic_tool
 
@@ -24,6 +25,39 @@ class MovieRecommendations(BaseModel):
     search_query: str
 
 
+# Build the validator once and share it across runs
+MOVIE_REC_ADAPTER = TypeAdapter(MovieRecommendations)
+
+
+# Simplified movie database
+_MOVIES = MappingProxyType({
+    "The Shawshank Redemption": {
+        "title": "The Shawshank Redemption",
+        "year": 1994,
+        "genre": "Drama",
+        "director": "Frank Darabont",
+        "description": "Two imprisoned men bond over a number of years, finding solace and eventual redemption through acts of common decency.",
+        "rating": 9.3
+    },
+    "The Godfather": {
+        "title": "The Godfather",
+        "year": 1972,
+        "genre": "Crime, Drama",
+        "director": "Francis Ford Coppola",
+        "description": "The aging patriarch of an organized crime dynasty transfers control to his reluctant son.",
+        "rating": 9.2
+    },
+    "Inception": {
+        "title": "Inception",
+        "year": 2010,
+        "genre": "Action, Sci-Fi",
+        "director": "Christopher Nolan",
+        "description": "A thief who steals corporate secrets through dream-sharing technology is given the task of planting an idea into the mind of a C.E.O.",
+        "rating": 8.8
+    }
+})
+
+
 # Define a tool for movie information
 @function_tool
 def get_movie_info(title: str) -> dict:
@@ -35,35 +69,12 @@ def get_movie_info(title: str) -> dict:
     Returns:
         Dictionary containing movie information.
     """
-    # Simplified movie database
-    movies = {
-        "The Shawshank Redemption": {
-            "title": "The Shawshank Redemption",
-            "year": 1994,
-            "genre": "Drama",
-            "director": "Frank Darabont",
-            "description": "Two imprisoned men bond over a number of years, finding solace and eventual redemption through acts of common decency.",
-            "rating": 9.3
-        },
-        "The Godfather": {
-            "title": "The Godfather",
-            "year": 1972,
-            "genre": "Crime, Drama",
-            "director": "Francis Ford Coppola",
-            "description": "The aging patriarch of an organized crime dynasty transfers control to his reluctant son.",
-            "rating": 9.2
-        },
-        "Inception": {
-            "title": "Inception",
-            "year": 2010,
-            "genre": "Action, Sci-Fi",
-            "director": "Christopher Nolan",
-            "description": "A thief who steals corporate secrets through dream-sharing technology is given the task of planting an idea into the mind of a C.E.O.",
-            "rating": 8.8
-        }
-    }
+    movie = _MOVIES.get(title)
+    if movie is None:
+        return {"error": f"Movie '{title}' not found"}
     
-    return movies.get(title, {"error": f"Movie '{title}' not found"})
+    # Copy the record so callers cannot change the shared table
+    return dict(movie)
 
 
 # Create an agent with Bedrock model
@@ -82,7 +93,8 @@ Your responses should focus on providing useful movie recommendations.""",
         temperature=0.2,  # Lower temperature for more deterministic responses
         max_iterations=5
     ),
-    output_type=MovieRecommendations  # Use Pydantic model for structured output
+    output_type=MovieRecommendations,  # Use Pydantic model for structured output
+    output_adapter=MOVIE_REC_ADAPTER
 )
 
 
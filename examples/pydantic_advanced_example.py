@@ -3,14 +3,30 @@ Advanced example showing Pydantic models for both input and output validation.
 """
 
 import asyncio
-from datetime import datetime
+import functools
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional, Union
-from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 from simple_agent import Agent, OpenAIModel, AgentConfig, pydantic_tool
 
 
+# --- Helpers ---
+
+@functools.lru_cache(maxsize=1024)
+def parse_iso(value: str) -> datetime:
+    """Parse an ISO date string, treating naive values as UTC."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
 # --- Define Pydantic models for structured input and output ---
 
 class TaskPriority(str, Enum):
@@ -36,12 +52,6 @@ class Task(BaseModel):
     due_date: Optional[datetime] = None
     status: TaskStatus = TaskStatus.TODO
     tags: List[str] = Field(default_factory=list)
-    
-    @validator('due_date')
-    def due_date_must_be_future(cls, v):
-        if v and v < datetime.now():
-            raise ValueError('Due date must be in the future')
-        return v
 
 
 class CreateTaskInput(BaseModel):
@@ -51,6 +61,13 @@ class CreateTaskInput(BaseModel):
     priority: TaskPriority
     due_date: Optional[str] = None  # ISO format date string
     tags: List[str] = Field(default_factory=list)
+    
+    @field_validator('due_date', mode='after')
+    @classmethod
+    def due_date_must_be_future(cls, v: Optional[str]) -> Optional[str]:
+        if v and parse_iso(v) < datetime.now(timezone.utc):
+            raise ValueError('Due date must be in the future')
+        return v
 
 
 class TaskResponse(BaseModel):
@@ -68,36 +85,139 @@ class TaskList(BaseModel):
 
 
 # --- Simulated task database ---
-task_db = {
-    1: Task(
+
+# Weight of each priority level when ranking open tasks
+PRIORITY_WEIGHT = {
+    TaskPriority.LOW: 1.0,
+    TaskPriority.MEDIUM: 2.0,
+    TaskPriority.HIGH: 3.0,
+    TaskPriority.CRITICAL: 4.0,
+}
+CLOSED_STATUSES = {TaskStatus.COMPLETED, TaskStatus.CANCELLED}
+
+class TaskStore:
+    """Thread-safe in-memory task storage with secondary indexes.
+    
+    Tasks are indexed by status, priority and tag so filtered lookups only
+    touch matching IDs. All mutations happen under one lock, so tools can
+    run concurrently without colliding on IDs or indexes.
+    """
+    
+    def __init__(self, seed_tasks: Iterable[Task] = ()):
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, Task] = {}
+        self._by_status: Dict[TaskStatus, Set[int]] = defaultdict(set)
+        self._by_priority: Dict[TaskPriority, Set[int]] = defaultdict(set)
+        self._by_tag: Dict[str, Set[int]] = defaultdict(set)
+        
+        for task in seed_tasks:
+            self._add(task)
+        self._ids = itertools.count(max(self._tasks, default=0) + 1)
+    
+    def _add(self, task: Task) -> None:
+        self._tasks[task.id] = task
+        self._by_status[task.status].add(task.id)
+        self._by_priority[task.priority].add(task.id)
+        for tag in task.tags:
+            self._by_tag[tag].add(task.id)
+    
+    def create(self, **fields: Any) -> Task:
+        """Validate and store a new task, assigning it the next ID."""
+        with self._lock:
+            task = Task(id=next(self._ids), **fields)
+            self._add(task)
+            return task
+    
+    def query(self, status: Optional[TaskStatus] = None,
+              priority: Optional[TaskPriority] = None,
+              tag: Optional[str] = None) -> List[Task]:
+        """Get tasks matching all of the given filters, ordered by ID."""
+        with self._lock:
+            # Look up the matching IDs in each index, smallest set first
+            candidates = []
+            if status:
+                candidates.append(self._by_status.get(status, set()))
+            if priority:
+                candidates.append(self._by_priority.get(priority, set()))
+            if tag:
+                candidates.append(self._by_tag.get(tag, set()))
+            
+            if candidates:
+                candidates.sort(key=len)
+                task_ids = candidates[0].intersection(*candidates[1:])
+            else:
+                task_ids = self._tasks.keys()
+            
+            return [self._tasks[task_id] for task_id in sorted(task_ids)]
+    
+    def prioritized(self, now: datetime, limit: int = 5) -> List[Task]:
+        """Rank open tasks by priority weight times deadline urgency.
+        
+        Scores are computed in a single pass over the open tasks. Overdue
+        tasks get the maximum urgency and tasks without a due date the least.
+        """
+        with self._lock:
+            scored = []
+            for task in self._tasks.values():
+                if task.status in CLOSED_STATUSES:
+                    continue
+                
+                if task.due_date is None:
+                    urgency = 0.1
+                else:
+                    days_left = (task.due_date - now).total_seconds() / 86400
+                    urgency = 1.0 / (1.0 + max(days_left, 0.0))
+                
+                scored.append((PRIORITY_WEIGHT.get(task.priority, 1.0) * urgency, task.id, task))
+        
+        return [task for _, _, task in heapq.nlargest(limit, scored)]
+    
+    def update_status(self, task_id: int, new_status: TaskStatus) -> Optional[Tuple[Task, TaskStatus]]:
+        """Set a task's status, returning the task and its old status."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return None
+            
+            old_status = task.status
+            task.status = new_status
+            
+            # Move the task to its new status bucket
+            self._by_status[old_status].discard(task_id)
+            self._by_status[new_status].add(task_id)
+            return task, old_status
+
+
+# Seed rows are trusted, so skip validation with model_construct
+store = TaskStore([
+    Task.model_construct(
         id=1,
         title="Implement agent framework",
         description="Create a simple agent framework combining OpenAI and Pydantic",
         priority=TaskPriority.HIGH,
-        due_date=datetime.fromisoformat("2025-04-15T00:00:00"),
+        due_date=parse_iso("2025-04-15T00:00:00"),
         status=TaskStatus.COMPLETED,
         tags=["coding", "ai"]
     ),
-    2: Task(
+    Task.model_construct(
         id=2,
         title="Write documentation",
         description="Document the agent framework with examples",
         priority=TaskPriority.MEDIUM,
-        due_date=datetime.fromisoformat("2025-04-20T00:00:00"),
+        due_date=parse_iso("2025-04-20T00:00:00"),
         status=TaskStatus.IN_PROGRESS,
         tags=["documentation", "writing"]
     ),
-    3: Task(
+    Task.model_construct(
         id=3,
         title="Add Bedrock support",
         description="Implement AWS Bedrock model integration",
         priority=TaskPriority.MEDIUM,
-        due_date=datetime.fromisoformat("2025-04-25T00:00:00"),
+        due_date=parse_iso("2025-04-25T00:00:00"),
         status=TaskStatus.TODO,
         tags=["coding", "aws"]
-    )
-}
-task_id_counter = 4
+    ),
+])
 
 
 # --- Define tools using pydantic_tool decorator ---
@@ -117,15 +237,15 @@ def create_task(title: str, description: str, priority: TaskPriority,
     Returns:
         TaskResponse with the created task details
     """
-    global task_id_counter
+    now = datetime.now(tz=timezone.utc)
     
     # Process the due date if provided
     parsed_due_date = None
     if due_date:
         try:
-            parsed_due_date = datetime.fromisoformat(due_date)
+            parsed_due_date = parse_iso(due_date)
             # Validate that due date is in the future
-            if parsed_due_date < datetime.now():
+            if parsed_due_date < now:
                 return TaskResponse(
                     success=False,
                     message="Due date must be in the future"
@@ -136,9 +256,8 @@ def create_task(title: str, description: str, priority: TaskPriority,
                 message=f"Invalid date format: {due_date}. Use ISO format (YYYY-MM-DDTHH:MM:SS)"
             )
     
-    # Create the task
-    new_task = Task(
-        id=task_id_counter,
+    # Create and save the task
+    new_task = store.create(
         title=title,
         description=description,
         priority=priority,
@@ -146,10 +265,6 @@ def create_task(title: str, description: str, priority: TaskPriority,
         tags=tags or []
     )
     
-    # Save to "database"
-    task_db[task_id_counter] = new_task
-    task_id_counter += 1
-    
     return TaskResponse(
         success=True,
         message="Task created successfully",
@@ -171,26 +286,13 @@ def get_tasks(status: Optional[TaskStatus] = None,
     Returns:
         List of tasks matching the filters
     """
-    filtered_tasks = task_db.values()
-    filter_description = []
-    
-    # Apply filters if provided
-    if status:
-        filtered_tasks = [t for t in filtered_tasks if t.status == status]
-        filter_description.append(f"status={status}")
+    filtered_tasks = store.query(status=status, priority=priority, tag=tag)
     
-    if priority:
-        filtered_tasks = [t for t in filtered_tasks if t.priority == priority]
-        filter_description.append(f"priority={priority}")
-    
-    if tag:
-        filtered_tasks = [t for t in filtered_tasks if tag in t.tags]
-        filter_description.append(f"tag={tag}")
-    
-    filter_applied = " AND ".join(filter_description) if filter_description else "none"
+    filters = (("status", status), ("priority", priority), ("tag", tag))
+    filter_applied = " AND ".join(f"{k}={v}" for k, v in filters if v) or "none"
     
     return TaskList(
-        tasks=list(filtered_tasks),
+        tasks=filtered_tasks,
         total_count=len(filtered_tasks),
         filter_applied=filter_applied
     )
@@ -207,17 +309,14 @@ def update_task_status(task_id: int, new_status: TaskStatus) -> TaskResponse:
     Returns:
         TaskResponse with the updated task details
     """
-    if task_id not in task_db:
+    updated = store.update_status(task_id, new_status)
+    if updated is None:
         return TaskResponse(
             success=False,
             message=f"Task with ID {task_id} not found"
         )
     
-    # Update the task status
-    task = task_db[task_id]
-    old_status = task.status
-    task.status = new_status
-    
+    task, old_status = updated
     return TaskResponse(
         success=True,
         message=f"Task status updated from {old_status} to {new_status}",
@@ -225,6 +324,25 @@ def update_task_status(task_id: int, new_status: TaskStatus) -> TaskResponse:
     )
 
 
+@pydantic_tool
+def get_prioritized_tasks(limit: int = 5) -> TaskList:
+    """Get the open tasks that should be worked on first.
+    
+    Args:
+        limit: Maximum number of tasks to return
+        
+    Returns:
+        Open tasks ranked by priority and deadline urgency
+    """
+    ranked_tasks = store.prioritized(datetime.now(tz=timezone.utc), limit=limit)
+    
+    return TaskList(
+        tasks=ranked_tasks,
+        total_count=len(ranked_tasks),
+        filter_applied="open tasks ranked by priority and urgency"
+    )
+
+
 # --- Define output model for the agent ---
 
 class TaskAnalysis(BaseModel):
@@ -237,12 +355,16 @@ class TaskAnalysis(BaseModel):
     summary: str
 
 
+# Build the validator once and share it across runs
+TASK_ANALYSIS_ADAPTER = TypeAdapter(TaskAnalysis)
+
+
 # --- Create the agent ---
 
 agent = Agent(
     name="TaskManagerAgent",
     instructions="""You are a task management assistant that helps users manage their tasks.
-You can create tasks, list tasks, and update task status.
+You can create tasks, list tasks, update task status, and rank open tasks by priority.
 
 When responding to the user, provide a detailed analysis of the current task state,
 along with helpful recommendations based on priorities and deadlines.
@@ -252,9 +374,10 @@ Always use the structured output format to present your analysis.
 Think step by step to ensure you're providing accurate recommendations.
 """,
     model=OpenAIModel(model="gpt-4o"),
-    tools=[create_task, get_tasks, update_task_status],
+    tools=[create_task, get_tasks, update_task_status, get_prioritized_tasks],
     config=AgentConfig(temperature=0.2),
-    output_type=TaskAnalysis
+    output_type=TaskAnalysis,
+    output_adapter=TASK_ANALYSIS_ADAPTER
 )
 
 
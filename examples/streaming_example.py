@@ -3,15 +3,22 @@ Example showing streaming capabilities of the Simple Agent Framework.
 """
 
 import asyncio
-from simple_agent import (
-    Agent, 
-    ContentChunkEvent, 
-    ToolCallEvent, 
-    ToolResultEvent, 
-    ErrorEvent, 
-    DoneEvent,
-    function_tool
-)
+import hashlib
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from simple_agent import Agent, StreamEvent, function_tool
+
+
+# Simulated database, keyed by lowercase topic
+DATABASE = {
+    "weather": "The weather is sunny with a high of 75°F.",
+    "sports": "The home team won 4-2 in yesterday's game.",
+    "news": "Latest headlines: New technology breakthrough announced.",
+    "stocks": "The market is up 2% today with tech stocks leading gains."
+}
+
+_WORD_RE = re.compile(r"\w+")
 
 
 # Define a simple tool that takes a bit of time to run
@@ -28,18 +35,9 @@ async def search_database(query: str) -> str:
     # Simulate a slow database search
     await asyncio.sleep(1)
     
-    databases = {
-        "weather": "The weather is sunny with a high of 75°F.",
-        "sports": "The home team won 4-2 in yesterday's game.",
-        "news": "Latest headlines: New technology breakthrough announced.",
-        "stocks": "The market is up 2% today with tech stocks leading gains."
-    }
-    
     # Find relevant info based on keywords in the query
-    results = []
-    for topic, info in databases.items():
-        if topic.lower() in query.lower():
-            results.append(info)
+    query_words = set(_WORD_RE.findall(query.lower()))
+    results = [info for topic, info in DATABASE.items() if topic in query_words]
     
     if not results:
         return "No relevant information found in the database."
@@ -57,6 +55,10 @@ If you don't find specific information, be honest about what you don't know.""",
 )
 
 
+def _ignore(event):
+    pass
+
+
 # Example 1: Synchronous streaming with event collection
 def run_sync_example():
     print("\n=== Synchronous Streaming Example ===")
@@ -68,40 +70,150 @@ def run_sync_example():
     content_chunks = []
     tool_calls = []
     
+    def on_content(event):
+        content_chunks.append(event.content)
+        print(f"Content: {event.content}", end="", flush=True)
+    
+    def on_tool_call(event):
+        tool_calls.append(event)
+        print(f"\nTool Call: {event.tool_name}({event.arguments})")
+    
+    # Indexed by EventKind
+    handlers = (
+        on_content,
+        on_tool_call,
+        lambda event: print(f"Tool Result: {event.result}"),
+        lambda event: print(f"Error: {event.message}"),
+        lambda event: print(
+            f"\nDone! Final content length: {len(event.final_content or '')}"
+        ),
+    )
+    
     for event in events:
-        if isinstance(event, ContentChunkEvent):
-            content_chunks.append(event.content)
-            print(f"Content: {event.content}", end="", flush=True)
-        elif isinstance(event, ToolCallEvent):
-            tool_calls.append(event)
-            print(f"\nTool Call: {event.tool_name}({event.arguments})")
-        elif isinstance(event, ToolResultEvent):
-            print(f"Tool Result: {event.result}")
-        elif isinstance(event, ErrorEvent):
-            print(f"Error: {event.message}")
-        elif isinstance(event, DoneEvent):
-            print(f"\nDone! Final content length: {len(event.final_content or '')}")
+        handlers[event.kind](event)
     
     # Print final statistics
     print(f"\nReceived {len(content_chunks)} content chunks and {len(tool_calls)} tool calls")
 
 
+class _SharedStream:
+    """Replay one agent stream to every subscriber, including late joiners."""
+    
+    def __init__(self, source: AsyncIterator[StreamEvent]):
+        self.events: List[StreamEvent] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+        self.task = asyncio.ensure_future(self._pump(source))
+    
+    async def _pump(self, source: AsyncIterator[StreamEvent]) -> None:
+        try:
+            async for event in source:
+                async with self._changed:
+                    self.events.append(event)
+                    self._changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+    
+    async def subscribe(self) -> AsyncIterator[StreamEvent]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.events) or self.done)
+                pending = self.events[index:]
+                finished = self.done
+            
+            for event in pending:
+                yield event
+            index += len(pending)
+            
+            if finished:
+                if self.error:
+                    raise self.error
+                return
+
+
+class _InflightCoalescer:
+    """Collapse concurrent identical queries onto a single agent run.
+    
+    Queries are keyed by the normalized prompt, the agent's tool names and
+    its model id. Entries are removed as soon as the shared run finishes, so
+    only queries that overlap in time are deduplicated.
+    """
+    
+    def __init__(self, agent: Agent):
+        self.agent = agent
+        self._runs: Dict[str, asyncio.Future] = {}
+        self._streams: Dict[str, _SharedStream] = {}
+        
+        tool_names = tuple(sorted(tool.name for tool in agent.tools))
+        model_id = getattr(agent.model, "model", None) or getattr(agent.model, "model_id", None)
+        self._scope = (tool_names, model_id)
+    
+    def _key(self, prompt: str) -> str:
+        normalized = " ".join(prompt.lower().split())
+        return hashlib.sha256(repr((normalized, self._scope)).encode("utf-8")).hexdigest()
+    
+    async def arun(self, prompt: str) -> Any:
+        key = self._key(prompt)
+        run = self._runs.get(key)
+        
+        # No await between the lookup and the insert, so this is race-free
+        if run is None:
+            run = asyncio.ensure_future(self.agent.arun(prompt))
+            self._runs[key] = run
+            run.add_done_callback(lambda _: self._runs.pop(key, None))
+        
+        # Shield so one caller being cancelled doesn't cancel the shared run
+        return await asyncio.shield(run)
+    
+    async def astream(self, prompt: str) -> AsyncIterator[StreamEvent]:
+        key = self._key(prompt)
+        shared = self._streams.get(key)
+        
+        if shared is None:
+            shared = _SharedStream(self.agent.astream(prompt))
+            self._streams[key] = shared
+            shared.task.add_done_callback(lambda _: self._streams.pop(key, None))
+        
+        async for event in shared.subscribe():
+            yield event
+
+
+coalescer = _InflightCoalescer(agent)
+
+
+# Handlers for the asynchronous example, indexed by EventKind
+ASYNC_HANDLERS = (
+    lambda event: print(f"{event.content}", end="", flush=True),
+    lambda event: print(f"\n[Calling tool: {event.tool_name}...]"),
+    lambda event: print(f"\n[Tool result received]"),
+    lambda event: print(f"\nError: {event.message}"),
+    lambda event: print("\n[Conversation complete]"),
+)
+
+
 # Example 2: Asynchronous streaming with real-time processing
 async def run_async_example():
     print("\n=== Asynchronous Streaming Example ===")
     
     # Process events as they arrive
     async for event in agent.astream("Tell me about the latest sports news and weather forecast."):
-        if isinstance(event, ContentChunkEvent):
-            print(f"{event.content}", end="", flush=True)
-        elif isinstance(event, ToolCallEvent):
-            print(f"\n[Calling tool: {event.tool_name}...]")
-        elif isinstance(event, ToolResultEvent):
-            print(f"\n[Tool result received]")
-        elif isinstance(event, ErrorEvent):
-            print(f"\nError: {event.message}")
-        elif isinstance(event, DoneEvent):
-            print("\n[Conversation complete]")
+        ASYNC_HANDLERS[event.kind](event)
+
+
+# Handlers for the interactive chat, indexed by EventKind
+CHAT_HANDLERS = (
+    lambda event: print(f"{event.content}", end="", flush=True),
+    lambda event: print(f"\n[Searching database...]", end="", flush=True),
+    _ignore,  # Just silently process tool results
+    lambda event: print(f"\nError: {event.message}", end="", flush=True),
+    lambda event: print(""),  # Add a newline at the end
+)
 
 
 # Example 3: Interactive chat with streaming
@@ -109,23 +221,17 @@ async def interactive_chat():
     print("\n=== Interactive Chat with Streaming ===")
     print("Type your messages (or 'exit' to quit):")
     
+    loop = asyncio.get_running_loop()
+    
     while True:
-        user_input = input("\nYou: ")
+        # Read input in a worker thread so the event loop keeps running
+        user_input = await loop.run_in_executor(None, input, "\nYou: ")
         if user_input.lower() in ("exit", "quit"):
             break
             
         print("Assistant: ", end="", flush=True)
-        async for event in agent.astream(user_input):
-            if isinstance(event, ContentChunkEvent):
-                print(f"{event.content}", end="", flush=True)
-            elif isinstance(event, ToolCallEvent):
-                print(f"\n[Searching database...]", end="", flush=True)
-            elif isinstance(event, ToolResultEvent):
-                pass  # Just silently process tool results
-            elif isinstance(event, ErrorEvent):
-                print(f"\nError: {event.message}", end="", flush=True)
-            elif isinstance(event, DoneEvent):
-                print("")  # Add a newline at the end
+        async for event in coalescer.astream(user_input):
+            CHAT_HANDLERS[event.kind](event)
 
 
 async def main():
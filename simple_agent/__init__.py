@@ -1,21 +1,69 @@
-from .agent import Agent, AgentConfig
-from .models import ModelBase, ModelResponse, OpenAIModel, BedrockModel
-from .tools import Tool, function_tool, pydantic_tool, ToolType
-from .stream import (
-    StreamEvent, 
-    ContentChunkEvent, 
-    ToolCallEvent, 
-    ToolResultEvent, 
-    ErrorEvent, 
-    DoneEvent, 
-    EventType
-)
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
 
+# Public names and the submodule defining each. They are imported on first
+# access so that, for example, using OpenAI never pulls in the Bedrock SDK.
+_LAZY_IMPORTS = {
+    "Agent": ".agent",
+    "AgentConfig": ".agent",
+    "get_shared_client": ".client",
+    "ModelBase": ".models",
+    "ModelResponse": ".models",
+    "OpenAIModel": ".models",
+    "BedrockModel": ".models",
+    "Tool": ".tools",
+    "function_tool": ".tools",
+    "pydantic_tool": ".tools",
+    "ToolType": ".tools",
+    # Stream components
+    "StreamEvent": ".stream",
+    "ContentChunkEvent": ".stream",
+    "ToolCallEvent": ".stream",
+    "ToolResultEvent": ".stream",
+    "ErrorEvent": ".stream",
+    "DoneEvent": ".stream",
+    "EventType": ".stream",
+    "EventKind": ".stream",
+}
+
+if TYPE_CHECKING:
+    from .agent import Agent, AgentConfig
+    from .client import get_shared_client
+    from .models import ModelBase, ModelResponse, OpenAIModel, BedrockModel
+    from .tools import Tool, function_tool, pydantic_tool, ToolType
+    from .stream import (
+        StreamEvent, 
+        ContentChunkEvent, 
+        ToolCallEvent, 
+        ToolResultEvent, 
+        ErrorEvent, 
+        DoneEvent, 
+        EventType,
+        EventKind
+    )
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache it so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 __all__ = [
     "Agent",
     "AgentConfig",
+    "get_shared_client",
     "ModelBase",
     "ModelResponse",
     "OpenAIModel",
@@ -32,4 +80,5 @@ __all__ = [
     "ErrorEvent",
     "DoneEvent",
     "EventType",
-]
\ No newline at end of file
+    "EventKind",
+]
@@ -0,0 +1,24 @@
+"""
+JSON helpers that use orjson when it is installed.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    # orjson accepts str or bytes and its JSONDecodeError subclasses json's
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+    
+    def dumps(obj) -> str:
+        """Serialize obj to a JSON string."""
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    loads = json.loads
+    dumps = json.dumps
+    JSONDecodeError = json.JSONDecodeError
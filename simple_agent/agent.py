@@ -1,24 +1,217 @@
 import asyncio
+import functools
 import inspect
-import json
 from dataclasses import dataclass, field
-from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Type, Union
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 
+try:
+    import uvloop
+except ImportError:  # Optional speedup, not available on Windows
+    uvloop = None
+
+from . import _json
 from .models.base import ModelBase, ModelResponse
 from .models.openai import OpenAIModel
 from .stream import ContentChunkEvent, DoneEvent, ErrorEvent, StreamEvent, ToolCallEvent, ToolResultEvent
 from .tools.base import Tool
 
 
-@dataclass
+# Event loop runner for the synchronous entry points
+_run_coroutine = uvloop.run if uvloop is not None else asyncio.run
+
+
+@functools.lru_cache(maxsize=None)
+def _type_adapter(tp: Any) -> TypeAdapter:
+    """Get a cached TypeAdapter so each type's validator is built only once."""
+    return TypeAdapter(tp)
+
+
+def _tool_call_message(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the assistant message that records a tool call."""
+    return {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+
+
+def _tool_result_message(tool_call_id: str, result: Any) -> Dict[str, Any]:
+    """Build the message that returns a tool's result to the model."""
+    return {"role": "tool", "tool_call_id": tool_call_id, "content": str(result)}
+
+
+def _looks_like_json(text: str) -> bool:
+    """Check whether text is a JSON object, ignoring surrounding whitespace.
+    
+    Scans from both ends instead of stripping, so the common case of plain
+    text is rejected without copying the string.
+    """
+    i, j = 0, len(text) - 1
+    
+    while i <= j and text[i].isspace():
+        i += 1
+    if i > j or text[i] != "{":
+        return False
+    
+    while text[j].isspace():
+        j -= 1
+    return j > i and text[j] == "}"
+
+
+def _context_window(messages: List[Dict[str, Any]], size: Optional[int]) -> List[Dict[str, Any]]:
+    """Get the messages to send: the system and first user message plus the
+    last size messages.
+    
+    The conversation itself is left untouched. The first user message is
+    always kept so the conversation never opens with an assistant turn. If
+    the cut would land on a tool result, it moves back to include the tool
+    call that produced it.
+    """
+    if size is None or len(messages) <= size + 2:
+        return messages
+    
+    start = len(messages) - size
+    while start > 2 and messages[start]["role"] == "tool":
+        start -= 1
+    
+    return [messages[0], messages[1], *messages[start:]]
+
+
+def _merge_chunks(chunks: List[str]) -> ContentChunkEvent:
+    """Combine held-back content chunks into one event and clear the list."""
+    content = chunks[0] if len(chunks) == 1 else "".join(chunks)
+    chunks.clear()
+    return ContentChunkEvent(content=content)
+
+
+async def _merged_stream(
+    stream: AsyncGenerator[StreamEvent, None],
+    chunk_batch: int,
+    flush_interval: float,
+) -> AsyncGenerator[StreamEvent, None]:
+    """Merge the content chunks of a model stream into fewer events.
+    
+    Chunks are held until chunk_batch of them are held or flush_interval
+    seconds have passed since the first one was. The stream is read in a
+    background task and the deadline is a timer, so held content still goes
+    out while the model stalls, at the cost of one timer per interval rather
+    than per chunk.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    pending_chunks: List[str] = []
+    flush_timer: Optional[asyncio.TimerHandle] = None
+    error: Optional[BaseException] = None
+    
+    def flush() -> None:
+        nonlocal flush_timer
+        flush_timer = None
+        if pending_chunks:
+            queue.put_nowait(_merge_chunks(pending_chunks))
+    
+    async def reader() -> None:
+        nonlocal flush_timer, error
+        try:
+            async for event in stream:
+                if isinstance(event, ContentChunkEvent):
+                    pending_chunks.append(event.content)
+                    if len(pending_chunks) >= chunk_batch:
+                        queue.put_nowait(_merge_chunks(pending_chunks))
+                    elif flush_timer is None:
+                        flush_timer = loop.call_later(flush_interval, flush)
+                    continue
+                
+                # Emit held-back content first so event order is preserved
+                if pending_chunks:
+                    queue.put_nowait(_merge_chunks(pending_chunks))
+                queue.put_nowait(event)
+        except Exception as e:
+            error = e
+        
+        if pending_chunks:
+            queue.put_nowait(_merge_chunks(pending_chunks))
+        queue.put_nowait(None)
+    
+    reader_task = asyncio.ensure_future(reader())
+    
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                if error is not None:
+                    raise error
+                return
+            yield event
+    finally:
+        # Stop reading if the consumer goes away early
+        if flush_timer is not None:
+            flush_timer.cancel()
+        reader_task.cancel()
+        await asyncio.wait([reader_task])
+        await stream.aclose()
+
+
+class _JsonArrayItemScanner:
+    """Incrementally extract the objects that are elements of a JSON array.
+    
+    Only the outermost such objects are returned, so arrays nested inside an
+    item stay part of that item.
+    """
+    
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._item_depth: Optional[int] = None
+        self._item: List[str] = []
+    
+    def feed(self, text: str) -> List[str]:
+        """Consume a chunk of text and return the JSON of any completed items."""
+        items = []
+        
+        for ch in text:
+            if self._item_depth is not None:
+                self._item.append(ch)
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{" or ch == "[":
+                if ch == "{" and self._item_depth is None and self._stack and self._stack[-1] == "[":
+                    # Start of a new array element
+                    self._item_depth = len(self._stack)
+                    self._item = [ch]
+                self._stack.append(ch)
+            elif ch == "}" or ch == "]":
+                if self._stack:
+                    self._stack.pop()
+                if ch == "}" and self._item_depth == len(self._stack):
+                    items.append("".join(self._item))
+                    self._item_depth = None
+                    self._item = []
+        
+        return items
+
+
+@dataclass(slots=True)
 class AgentConfig:
     """Configuration options for an agent."""
     
     temperature: float = 0.7
     max_tokens: Optional[int] = None
     max_iterations: int = 10
+    # Merge streamed content chunks until this many are held or this much
+    # time has passed; set stream_chunk_batch to 1 for per-token events
+    stream_chunk_batch: int = 8
+    stream_flush_interval_ms: float = 20.0
+    # Send only the system message, the first user message and this many of
+    # the latest messages to the model on each turn (at least 1); None sends
+    # the whole conversation
+    context_window: Optional[int] = None
 
 
 class Agent:
@@ -36,6 +229,7 @@ class Agent:
         tools: List[Union[Tool, Callable]] = None,
         config: Optional[AgentConfig] = None,
         output_type: Optional[Type[BaseModel]] = None,
+        output_adapter: Optional[TypeAdapter] = None,
     ):
         """Initialize a new agent.
         
@@ -46,6 +240,9 @@ class Agent:
             tools: List of tools the agent can use.
             config: Configuration options.
             output_type: Optional Pydantic model for structured output.
+            output_adapter: Optional prebuilt TypeAdapter used to validate
+                structured output. Share one across agents to avoid rebuilding
+                the validator.
         """
         self.name = name
         self.instructions = instructions
@@ -53,6 +250,10 @@ class Agent:
         self.tools = []
         self.config = config or AgentConfig()
         self.output_type = output_type
+        self.output_adapter = output_adapter
+        
+        if self.config.context_window is not None and self.config.context_window < 1:
+            raise ValueError(f"context_window must be at least 1, got {self.config.context_window}")
         
         # Process tools
         if tools:
@@ -64,6 +265,28 @@ class Agent:
                     self.tools.append(tool)
                 else:
                     raise ValueError(f"Tool must be a Tool instance or decorated function, got {type(tool)}")
+        
+        # Bind the structured output validator once instead of per response
+        if output_adapter is not None:
+            self._output_validator = output_adapter.validate_json
+        elif output_type is not None:
+            self._output_validator = _type_adapter(output_type).validate_json
+        else:
+            self._output_validator = None
+        
+        # Build the parts of each request that don't change between runs
+        self._system_message = {"role": "system", "content": self.instructions}
+        self.invalidate_tool_cache()
+    
+    def invalidate_tool_cache(self) -> None:
+        """Rebuild the cached tool definitions.
+        
+        Tool definitions are serialized once and reused by every run, so call
+        this after modifying self.tools.
+        """
+        self._tool_dicts = [tool.to_dict() for tool in self.tools] or None
+        # Reversed so the first tool wins if two share a name
+        self._tools_by_name = {tool.name: tool for tool in reversed(self.tools)}
     
     async def arun(self, input_text: str) -> Any:
         """Run the agent asynchronously.
@@ -77,72 +300,55 @@ class Agent:
         """
         # Initialize conversation history
         messages = [
-            {"role": "system", "content": self.instructions},
+            self._system_message,
             {"role": "user", "content": input_text}
         ]
         
-        # Convert tools to the format expected by the model
-        tool_dicts = [tool.to_dict() for tool in self.tools]
+        # Read settings once rather than on every iteration
+        config = self.config
+        temperature = config.temperature
+        max_tokens = config.max_tokens
+        context_window = config.context_window
+        tool_dicts = self._tool_dicts
+        generate = self.model.generate
         
-        # Run the agent loop
-        iterations = 0
-        
-        while iterations < self.config.max_iterations:
-            iterations += 1
-            
+        # Run the agent loop; every completed turn returns from inside it
+        for _iteration in range(config.max_iterations):
             # Generate a response from the model
-            response = await self.model.generate(
-                messages=messages,
-                tools=tool_dicts if self.tools else None,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
+            response = await generate(
+                messages=_context_window(messages, context_window),
+                tools=tool_dicts,
+                temperature=temperature,
+                max_tokens=max_tokens,
             )
             
             # If there are tool calls, execute them
             if response.tool_calls:
-                for tool_call in response.tool_calls:
-                    # Find the matching tool
-                    tool_name = tool_call["function"]["name"]
-                    tool = next((t for t in self.tools if t.name == tool_name), None)
-                    
-                    if not tool:
-                        error_msg = f"Tool '{tool_name}' not found"
-                        tool_response = {"error": error_msg}
-                    else:
-                        try:
-                            # Execute the tool with the provided arguments
-                            args = tool_call["function"]["arguments"]
-                            tool_result = await tool.execute(**args)
-                            tool_response = tool_result
-                        except Exception as e:
-                            tool_response = {"error": str(e)}
-                    
+                # Run the tools concurrently; gather keeps results in call order
+                tool_results = await asyncio.gather(*(
+                    self._invoke_tool(
+                        tool_call["function"]["name"],
+                        tool_call["function"]["arguments"],
+                    )
+                    for tool_call in response.tool_calls
+                ))
+                
+                for tool_call, (tool_response, _) in zip(response.tool_calls, tool_results):
                     # Add the tool call and result to the conversation
-                    messages.append({
-                        "role": "assistant",
-                        "content": None,
-                        "tool_calls": [tool_call]
-                    })
-                    
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call["id"],
-                        "content": str(tool_response),
-                    })
+                    messages.append(_tool_call_message(tool_call))
+                    messages.append(_tool_result_message(tool_call["id"], tool_response))
             else:
                 # No tool calls, agent has completed its task
                 if response.content is None:
                     response.content = ""
                     
                 # Parse structured output if requested
-                if self.output_type and response.content:
+                if self._output_validator is not None and response.content:
                     try:
                         # Try to parse as JSON if it looks like JSON
-                        content = response.content.strip()
-                        if content.startswith("{") and content.endswith("}"):
-                            import json
-                            parsed = json.loads(content)
-                            return self.output_type(**parsed)
+                        content = response.content
+                        if _looks_like_json(content):
+                            return self._output_validator(content)
                         else:
                             # Fall back to returning the raw content
                             return response.content
@@ -167,127 +373,221 @@ class Agent:
         """
         # Initialize conversation history
         messages = [
-            {"role": "system", "content": self.instructions},
+            self._system_message,
             {"role": "user", "content": input_text}
         ]
         
-        # Convert tools to the format expected by the model
-        tool_dicts = [tool.to_dict() for tool in self.tools]
-        
-        # Run the agent loop
-        iterations = 0
         final_content = ""
         
-        while iterations < self.config.max_iterations:
-            iterations += 1
-            
-            # Generate a streaming response from the model
-            content_buffer = ""
-            async for event in self.model.generate_stream(
-                messages=messages,
-                tools=tool_dicts if self.tools else None,
-                temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens,
-            ):
-                # Pass through content chunk events
-                if isinstance(event, ContentChunkEvent):
-                    content_buffer += event.content
-                    yield event
+        # Tool calls started during the current model response
+        pending_calls: List[Tuple[ToolCallEvent, asyncio.Task]] = []
+        
+        # Read settings once rather than on every iteration
+        config = self.config
+        temperature = config.temperature
+        max_tokens = config.max_tokens
+        context_window = config.context_window
+        tool_dicts = self._tool_dicts
+        generate_stream = self.model.generate_stream
+        
+        # Content chunks are merged before they reach the consumer
+        chunk_batch = config.stream_chunk_batch
+        flush_interval = config.stream_flush_interval_ms / 1000
+        
+        try:
+            # Run the agent loop; every completed turn returns from inside it
+            for _iteration in range(config.max_iterations):
+                # Generate a streaming response from the model
+                tool_called = False
+                events = generate_stream(
+                    messages=_context_window(messages, context_window),
+                    tools=tool_dicts,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+                if chunk_batch > 1:
+                    events = _merged_stream(events, chunk_batch, flush_interval)
                 
-                # Handle tool call events
-                elif isinstance(event, ToolCallEvent):
-                    # Find the matching tool
-                    tool_name = event.tool_name
-                    tool = next((t for t in self.tools if t.name == tool_name), None)
-                    
-                    # Forward the tool call event
-                    yield event
-                    
-                    if not tool:
-                        error_msg = f"Tool '{tool_name}' not found"
-                        yield ErrorEvent(message=error_msg)
-                        tool_response = {"error": error_msg}
-                    else:
-                        try:
-                            # Execute the tool with the provided arguments
-                            tool_result = await tool.execute(**event.arguments)
+                try:
+                    async for event in events:
+                        # Pass through content chunk events
+                        if isinstance(event, ContentChunkEvent):
+                            yield event
+                        
+                        # Handle tool call events
+                        elif isinstance(event, ToolCallEvent):
+                            tool_called = True
+                            
+                            # Forward the tool call event
+                            yield event
                             
-                            # Yield tool result event
-                            yield ToolResultEvent(
-                                tool_name=tool_name,
-                                tool_id=event.tool_id,
-                                result=tool_result
+                            # Start the tool now so it runs while the response
+                            # keeps streaming and alongside other tool calls
+                            task = asyncio.ensure_future(
+                                self._invoke_tool(event.tool_name, event.arguments)
                             )
+                            pending_calls.append((event, task))
+                        
+                        # Handle error events
+                        elif isinstance(event, ErrorEvent):
+                            yield event
+                        
+                        # Handle done events
+                        elif isinstance(event, DoneEvent):
+                            if event.final_content:
+                                final_content = event.final_content
                             
-                            tool_response = tool_result
-                        except Exception as e:
-                            error_message = str(e)
-                            yield ErrorEvent(message=f"Error executing tool '{tool_name}': {error_message}")
-                            tool_response = {"error": error_message}
-                    
-                    # Add the tool call and result to the conversation
-                    messages.append({
-                        "role": "assistant",
-                        "content": None,
-                        "tool_calls": [{
-                            "id": event.tool_id,
-                            "type": "function",
-                            "function": {
-                                "name": tool_name,
-                                "arguments": json.dumps(event.arguments)
-                            }
-                        }]
-                    })
-                    
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": event.tool_id,
-                        "content": str(tool_response),
-                    })
+                            async for result_event in self._finish_tool_calls(pending_calls, messages):
+                                yield result_event
+                            
+                            if tool_called:
+                                # If there were tool calls, continue the conversation
+                                break
+                            else:
+                                # No tool calls, we're done
+                                yield DoneEvent(final_content=final_content)
+                                
+                                # Parse structured output if requested
+                                if self._output_validator is not None and final_content:
+                                    try:
+                                        # Try to parse as JSON if it looks like JSON
+                                        content = final_content
+                                        if _looks_like_json(content):
+                                            structured_output = self._output_validator(content)
+                                            # We're done here, return
+                                            return
+                                    except Exception as e:
+                                        # If parsing fails, just continue
+                                        pass
+                                
+                                # We're done, return from the generator
+                                return
+                finally:
+                    await events.aclose()
                 
-                # Handle error events
-                elif isinstance(event, ErrorEvent):
-                    yield event
+                # The stream may end without a done event
+                async for result_event in self._finish_tool_calls(pending_calls, messages):
+                    yield result_event
                 
-                # Handle done events
-                elif isinstance(event, DoneEvent):
-                    if event.final_content:
-                        final_content = event.final_content
-                    
-                    # Check if there were tool calls by looking at the last message
-                    if messages and messages[-1]["role"] == "tool":
-                        # If there were tool calls, continue the conversation
-                        break
-                    else:
-                        # No tool calls, we're done
-                        yield DoneEvent(final_content=final_content)
-                        
-                        # Parse structured output if requested
-                        if self.output_type and final_content:
-                            try:
-                                # Try to parse as JSON if it looks like JSON
-                                content = final_content.strip()
-                                if content.startswith("{") and content.endswith("}"):
-                                    parsed = json.loads(content)
-                                    structured_output = self.output_type(**parsed)
-                                    # We're done here, return
-                                    return
-                            except Exception as e:
-                                # If parsing fails, just continue
-                                pass
-                        
-                        # We're done, return from the generator
-                        return
+                # If we've reached here, we've processed a complete model response
+                # and potentially executed tools. If no tools were called, we're done.
+                if not tool_called:
+                    yield DoneEvent(final_content=final_content)
+                    return
             
-            # If we've reached here, we've processed a complete model response
-            # and potentially executed tools. If no tools were called, we're done.
-            if not messages or messages[-1]["role"] != "tool":
-                yield DoneEvent(final_content=final_content)
-                return
+            # If we hit the iteration limit without completion
+            yield ErrorEvent(message="Maximum iterations reached without completing the task.")
+            yield DoneEvent(final_content=final_content)
+        finally:
+            # Don't leave tools running if the consumer stops early
+            for _, task in pending_calls:
+                task.cancel()
+    
+    async def _invoke_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Tuple[Any, Optional[str]]:
+        """Execute a single tool call.
         
-        # If we hit the iteration limit without completion
-        yield ErrorEvent(message="Maximum iterations reached without completing the task.")
-        yield DoneEvent(final_content=final_content)
+        Args:
+            tool_name: Name of the tool to call.
+            arguments: Arguments provided by the model.
+            
+        Returns:
+            The response to send back to the model, and an error message if
+            the tool was not found or raised.
+        """
+        tool = self._tools_by_name.get(tool_name)
+        
+        if not tool:
+            error_msg = f"Tool '{tool_name}' not found"
+            return {"error": error_msg}, error_msg
+        
+        try:
+            # Execute the tool with the provided arguments
+            return await tool.execute(**arguments), None
+        except Exception as e:
+            return {"error": str(e)}, f"Error executing tool '{tool_name}': {e}"
+    
+    async def _finish_tool_calls(
+        self,
+        pending_calls: List[Tuple[ToolCallEvent, asyncio.Task]],
+        messages: List[Dict[str, Any]],
+    ) -> AsyncGenerator[StreamEvent, None]:
+        """Wait for running tool calls, yielding results as each one finishes.
+        
+        Once all calls are done, they are added to the conversation in the
+        order the model made them, and pending_calls is cleared.
+        """
+        order = {task: i for i, (_, task) in enumerate(pending_calls)}
+        remaining = set(order)
+        
+        while remaining:
+            done, remaining = await asyncio.wait(remaining, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in sorted(done, key=order.get):
+                event = pending_calls[order[task]][0]
+                tool_response, error_msg = task.result()
+                
+                if error_msg:
+                    yield ErrorEvent(message=error_msg)
+                else:
+                    yield ToolResultEvent(
+                        tool_name=event.tool_name,
+                        tool_id=event.tool_id,
+                        result=tool_response
+                    )
+        
+        for event, task in pending_calls:
+            tool_response, _ = task.result()
+            
+            # Add the tool call and result to the conversation
+            messages.append(_tool_call_message({
+                "id": event.tool_id,
+                "type": "function",
+                "function": {
+                    "name": event.tool_name,
+                    "arguments": (
+                        event.arguments_raw
+                        if event.arguments_raw is not None
+                        else _json.dumps(event.arguments)
+                    )
+                }
+            }))
+            messages.append(_tool_result_message(event.tool_id, tool_response))
+        
+        pending_calls.clear()
+    
+    async def astream_structured(
+        self,
+        input_text: str,
+        item_type: Type[BaseModel],
+    ) -> AsyncGenerator[BaseModel, None]:
+        """Run the agent with streaming, yielding list items as they complete.
+        
+        The streamed content is scanned as partial JSON, and each object that
+        closes inside an array is validated as item_type and yielded right
+        away, before the rest of the response has been generated. Objects
+        that don't validate as item_type are skipped.
+        
+        Args:
+            input_text: The input text from the user.
+            item_type: Pydantic model for the elements of the list in the
+                structured output, e.g. MovieRecommendation.
+            
+        Returns:
+            An async generator that yields item_type instances.
+        """
+        adapter = _type_adapter(item_type)
+        scanner = _JsonArrayItemScanner()
+        
+        async for event in self.astream(input_text):
+            if isinstance(event, ToolCallEvent):
+                # Content before a tool call isn't part of the final answer
+                scanner = _JsonArrayItemScanner()
+            elif isinstance(event, ContentChunkEvent):
+                for item in scanner.feed(event.content):
+                    try:
+                        yield adapter.validate_json(item)
+                    except ValidationError:
+                        continue
     
     def run(self, input_text: str) -> Any:
         """Run the agent synchronously.
@@ -298,7 +598,7 @@ class Agent:
         Returns:
             The agent's response.
         """
-        return asyncio.run(self.arun(input_text))
+        return _run_coroutine(self.arun(input_text))
     
     def stream(self, input_text: str) -> List[StreamEvent]:
         """Run the agent synchronously with streaming, collecting all events.
@@ -315,5 +615,5 @@ class Agent:
             async for event in self.astream(input_text):
                 events.append(event)
                 
-        asyncio.run(collect_events())
+        _run_coroutine(collect_events())
         return events
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+Shared HTTP client for the simple agent framework.
+"""
+
+import asyncio
+import importlib.util
+import weakref
+from typing import Optional
+
+import httpx
+
+# HTTP/2 needs the optional h2 package, part of the speedups extra
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connections belong to the loop that opened them, so each loop gets a client
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# Client handed out while no loop was running, adopted by the next loop to ask
+_unbound_client: Optional[httpx.AsyncClient] = None
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=120.0,
+    )
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get the HTTP client shared within the running event loop.
+
+    Model providers default to this client so connections stay alive across
+    requests and only the first one pays for the TCP and TLS handshake. Each
+    event loop, such as the one started by every Agent.run call, gets its own
+    client because pooled connections cannot move between loops. Outside a
+    running loop, for example while a model is constructed, the client
+    returned becomes the shared client of the next loop that asks for one.
+
+    Returns:
+        The shared httpx.AsyncClient for the running loop.
+    """
+    global _unbound_client
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        if _unbound_client is None or _unbound_client.is_closed:
+            _unbound_client = _new_client()
+        return _unbound_client
+
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        # Drop clients left behind by loops that have finished
+        for old_loop in [old_loop for old_loop in _shared_clients if old_loop.is_closed()]:
+            del _shared_clients[old_loop]
+
+        if _unbound_client is not None and not _unbound_client.is_closed:
+            client, _unbound_client = _unbound_client, None
+        else:
+            client = _new_client()
+        _shared_clients[loop] = client
+
+    return client
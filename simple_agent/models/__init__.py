@@ -1,5 +1,20 @@
+from typing import TYPE_CHECKING
+
 from .base import ModelBase, ModelResponse
 from .openai import OpenAIModel
-from .bedrock import BedrockModel
 
-__all__ = ["ModelBase", "ModelResponse", "OpenAIModel", "BedrockModel"]
\ No newline at end of file
+if TYPE_CHECKING:
+    from .bedrock import BedrockModel
+
+
+def __getattr__(name):
+    # BedrockModel pulls in boto3, so only import it when it is asked for
+    if name == "BedrockModel":
+        from .bedrock import BedrockModel
+        
+        globals()[name] = BedrockModel
+        return BedrockModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["ModelBase", "ModelResponse", "OpenAIModel", "BedrockModel"]
@@ -6,7 +6,11 @@ from ..stream import StreamEvent
 
 
 class ModelResponse(PydanticBaseModel):
-    """A standardized response format from any model provider."""
+    """A standardized response format from any model provider.
+    
+    Providers build responses from data they have already checked, so they
+    may use model_construct to skip validation.
+    """
     
     content: Optional[str] = None
     tool_calls: List[Dict[str, Any]] = Field(default_factory=list)
@@ -1,13 +1,119 @@
+import asyncio
+import functools
 import json
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional
 
 import boto3
+from botocore.config import Config
 from pydantic import BaseModel, Field
 
+from .. import _json
 from .base import ModelBase, ModelResponse
 from ..stream import StreamEvent, ContentChunkEvent, ToolCallEvent, DoneEvent, ErrorEvent
 
 
+# Anthropic stream chunk types
+_TYPE_BLOCK_START = "content_block_start"
+_TYPE_DELTA = "content_block_delta"
+_TYPE_BLOCK_STOP = "content_block_stop"
+_TYPE_TOOL = "tool_use"
+_TYPE_INPUT_DELTA = "input_json_delta"
+_TYPE_STOP = "message_stop"
+
+# Sized for many concurrent agents sharing one client
+_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+)
+
+# Marks the end of a stream drained in a worker thread
+_STREAM_END = object()
+
+# Each live stream holds a thread until it is drained, so streams get their
+# own pool rather than starving to_thread calls and tools in the default
+# executor; sized to the client's connection pool
+_STREAM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_CLIENT_CONFIG.max_pool_connections,
+    thread_name_prefix="bedrock-stream",
+)
+
+
+async def _iterate_in_thread(iterable: Iterable[Any]) -> AsyncGenerator[Any, None]:
+    """Iterate a blocking iterable in a worker thread.
+    
+    boto3 response streams block on every read, so they are drained in a
+    dedicated thread pool and handed back to the event loop through a queue.
+    At most 64 streams are drained at once; further streams wait for a free
+    worker.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+    
+    def drain() -> None:
+        error = None
+        try:
+            for item in iterable:
+                if stopped.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+        except Exception as e:
+            error = e
+        
+        if not stopped.is_set():
+            loop.call_soon_threadsafe(queue.put_nowait, (_STREAM_END, error))
+    
+    worker = loop.run_in_executor(_STREAM_EXECUTOR, drain)
+    
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _STREAM_END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # Let the worker stop early if the consumer goes away
+        stopped.set()
+        
+        # Closing the stream, as botocore's EventStream allows, unblocks a
+        # worker waiting on a read and releases the connection
+        close = getattr(iterable, "close", None)
+        if close is not None and not worker.done():
+            try:
+                close()
+            except Exception:
+                # The worker still stops once its current read returns
+                pass
+        await asyncio.wait((worker,))
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_client(
+    region_name: str,
+    aws_access_key_id: Optional[str],
+    aws_secret_access_key: Optional[str],
+) -> Any:
+    """Get a bedrock-runtime client shared by models with the same settings.
+    
+    boto3 clients are thread-safe, so one client and its connection pool
+    can serve every model in the process.
+    """
+    session_kwargs = {"region_name": region_name}
+    if aws_access_key_id and aws_secret_access_key:
+        session_kwargs.update({
+            "aws_access_key_id": aws_access_key_id,
+            "aws_secret_access_key": aws_secret_access_key,
+        })
+        
+    session = boto3.Session(**session_kwargs)
+    return session.client("bedrock-runtime", config=_CLIENT_CONFIG)
+
+
 class BedrockModel(ModelBase):
     """AWS Bedrock model provider implementation."""
     
@@ -17,6 +123,7 @@ class BedrockModel(ModelBase):
         region_name: str = "us-east-1",
         aws_access_key_id: Optional[str] = None,
         aws_secret_access_key: Optional[str] = None,
+        client: Optional[Any] = None,
     ):
         """Initialize the Bedrock model.
         
@@ -25,23 +132,39 @@ class BedrockModel(ModelBase):
             region_name: AWS region name.
             aws_access_key_id: Optional AWS access key ID.
             aws_secret_access_key: Optional AWS secret access key.
+            client: Optional prebuilt bedrock-runtime client. By default,
+                models with the same region and credentials share a client.
+                The region and credentials are ignored when given.
         """
         self.model_id = model_id
         
-        # Create Bedrock runtime client
-        session_kwargs = {"region_name": region_name}
-        if aws_access_key_id and aws_secret_access_key:
-            session_kwargs.update({
-                "aws_access_key_id": aws_access_key_id,
-                "aws_secret_access_key": aws_secret_access_key,
-            })
-            
-        session = boto3.Session(**session_kwargs)
-        self.client = session.client("bedrock-runtime")
+        if client is not None:
+            self.client = client
+        else:
+            # Reuse the client (and its connection pool) for these settings
+            self.client = _shared_client(region_name, aws_access_key_id, aws_secret_access_key)
         
         # Determine model provider from model_id for appropriate formatting
         self.provider = model_id.split(".")[0] if "." in model_id else "anthropic"
         
+        # Resolve the provider-specific handlers once, instead of per call
+        if self.provider == "anthropic":
+            self._format_request = self._format_anthropic_request
+            self._parse_response = self._parse_anthropic_response
+            self._read_stream = self._read_anthropic_stream
+            self._stream_flag = "stream"
+        elif self.provider == "amazon":
+            self._format_request = self._format_titan_request
+            self._parse_response = self._parse_titan_response
+            self._read_stream = self._read_titan_stream
+            # Amazon Titan uses a different streaming parameter
+            self._stream_flag = "streamEnabled"
+        else:
+            self._format_request = self._unsupported_provider
+            self._parse_response = self._unsupported_provider
+            self._read_stream = self._unsupported_provider
+            self._stream_flag = None
+        
     async def generate(
         self,
         messages: List[Dict[str, Any]],
@@ -52,22 +175,25 @@ class BedrockModel(ModelBase):
         """Generate a response from Bedrock."""
         
         # Format request body based on provider
-        if self.provider == "anthropic":
-            body = self._format_anthropic_request(messages, tools, temperature, max_tokens)
-        elif self.provider == "amazon":
-            body = self._format_titan_request(messages, tools, temperature, max_tokens)
-        else:
-            raise ValueError(f"Unsupported model provider: {self.provider}")
+        body = self._format_request(messages, tools, temperature, max_tokens)
+        
+        # Invoke model and read the body off the event loop
+        response_body = await asyncio.to_thread(self._invoke, body)
+        
+        return self._parse_response(response_body)
+    
+    def _invoke(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke the model and read its response body.
         
-        # Invoke model
+        boto3 is synchronous, so this runs in a worker thread and only the
+        parsed response crosses back to the event loop.
+        """
         response = self.client.invoke_model(
             modelId=self.model_id,
             body=json.dumps(body)
         )
         
-        response_body = json.loads(response.get("body").read().decode("utf-8"))
-        
-        return self._parse_response(response_body)
+        return json.loads(response.get("body").read().decode("utf-8"))
     
     async def generate_stream(
         self,
@@ -80,73 +206,123 @@ class BedrockModel(ModelBase):
         
         try:
             # Format request body based on provider with streaming enabled
-            if self.provider == "anthropic":
-                body = self._format_anthropic_request(messages, tools, temperature, max_tokens)
-                body["stream"] = True
-            elif self.provider == "amazon":
-                body = self._format_titan_request(messages, tools, temperature, max_tokens)
-                # Amazon Titan uses a different streaming parameter
-                body["streamEnabled"] = True
-            else:
-                raise ValueError(f"Unsupported model provider: {self.provider}")
+            body = self._format_request(messages, tools, temperature, max_tokens)
+            body[self._stream_flag] = True
             
-            # Invoke model with streaming
-            response_stream = self.client.invoke_model_with_response_stream(
+            # Invoke model with streaming, off the event loop
+            response_stream = await asyncio.to_thread(
+                self.client.invoke_model_with_response_stream,
                 modelId=self.model_id,
                 body=json.dumps(body)
             )
             
-            content_buffer = ""
-            tool_calls_buffer = {}
-            
-            # Process the streaming response based on provider
-            if self.provider == "anthropic":
-                # Process Claude streaming response
-                for event in response_stream.get("body"):
-                    if "chunk" in event:
-                        chunk_data = json.loads(event["chunk"]["bytes"].decode("utf-8"))
-                        
-                        # Handle content chunks
-                        if "type" in chunk_data and chunk_data["type"] == "content_block_delta":
-                            if "delta" in chunk_data and "text" in chunk_data["delta"]:
-                                text = chunk_data["delta"]["text"]
-                                content_buffer += text
-                                yield ContentChunkEvent(content=text)
-                        
-                        # Handle tool use (Claude's tool calling)
-                        elif "type" in chunk_data and chunk_data["type"] == "tool_use":
-                            tool_name = chunk_data.get("name", "")
-                            tool_id = chunk_data.get("id", f"tool_{len(tool_calls_buffer)}")
-                            arguments = chunk_data.get("input", {})
-                            
-                            yield ToolCallEvent(
-                                tool_name=tool_name,
-                                tool_id=tool_id,
-                                arguments=arguments
-                            )
-                            
-                        # Handle completion events
-                        elif "type" in chunk_data and chunk_data["type"] == "message_stop":
-                            yield DoneEvent(final_content=content_buffer)
-                
-            elif self.provider == "amazon":
-                # Process Titan streaming response
-                for event in response_stream.get("body"):
-                    if "chunk" in event:
-                        chunk_data = json.loads(event["chunk"]["bytes"].decode("utf-8"))
-                        
-                        if "outputText" in chunk_data:
-                            text = chunk_data["outputText"]
-                            content_buffer += text
-                            yield ContentChunkEvent(content=text)
-                            
-                # Yield final event when stream is complete
-                yield DoneEvent(final_content=content_buffer)
+            async for event in self._read_stream(response_stream.get("body")):
+                yield event
                 
         except Exception as e:
             yield ErrorEvent(message=f"Error during streaming: {str(e)}")
             yield DoneEvent(final_content=None)
     
+    async def _read_anthropic_stream(self, body_stream: Iterable[Any]) -> AsyncGenerator[StreamEvent, None]:
+        """Convert a Claude response stream into stream events.
+        
+        Tool calls arrive as a content block whose input is streamed in JSON
+        fragments, so they are collected per block and emitted as a single
+        ToolCallEvent when the block stops.
+        """
+        content_parts: List[str] = []
+        tool_call_count = 0
+        
+        # Tool use blocks still being streamed, by content block index
+        tool_blocks: Dict[int, Dict[str, Any]] = {}
+        
+        async for event in _iterate_in_thread(body_stream):
+            if "chunk" in event:
+                # Parse the raw bytes directly, without decoding first
+                chunk_data = _json.loads(event["chunk"]["bytes"])
+                chunk_type = chunk_data.get("type")
+                
+                # Handle content chunks and streamed tool arguments
+                if chunk_type == _TYPE_DELTA:
+                    delta = chunk_data.get("delta", {})
+                    text = delta.get("text")
+                    if text is not None:
+                        content_parts.append(text)
+                        yield ContentChunkEvent(content=text)
+                    elif delta.get("type") == _TYPE_INPUT_DELTA:
+                        block = tool_blocks.get(chunk_data.get("index"))
+                        if block is not None:
+                            block["fragments"].append(delta.get("partial_json", ""))
+                
+                # Start collecting a streamed tool use block
+                elif chunk_type == _TYPE_BLOCK_START:
+                    content_block = chunk_data.get("content_block", {})
+                    if content_block.get("type") == _TYPE_TOOL:
+                        tool_blocks[chunk_data.get("index")] = {
+                            "id": content_block.get("id", f"tool_{tool_call_count}"),
+                            "name": content_block.get("name", ""),
+                            "fragments": [],
+                        }
+                        tool_call_count += 1
+                
+                # Emit a tool call once its arguments are complete
+                elif chunk_type == _TYPE_BLOCK_STOP:
+                    block = tool_blocks.pop(chunk_data.get("index"), None)
+                    if block is not None:
+                        raw_args = "".join(block["fragments"]) or "{}"
+                        
+                        # Report bad arguments for this call only and keep
+                        # reading the rest of the response
+                        try:
+                            arguments = _json.loads(raw_args)
+                        except _json.JSONDecodeError as e:
+                            yield ErrorEvent(message=f"Invalid arguments for tool '{block['name']}': {e}")
+                            continue
+                        
+                        yield ToolCallEvent(
+                            tool_name=block["name"],
+                            tool_id=block["id"],
+                            arguments=arguments,
+                            arguments_raw=raw_args
+                        )
+                
+                # Handle a tool use sent whole (Claude's tool calling)
+                elif chunk_type == _TYPE_TOOL:
+                    tool_name = chunk_data.get("name", "")
+                    tool_id = chunk_data.get("id", f"tool_{tool_call_count}")
+                    arguments = chunk_data.get("input", {})
+                    tool_call_count += 1
+                    
+                    yield ToolCallEvent(
+                        tool_name=tool_name,
+                        tool_id=tool_id,
+                        arguments=arguments
+                    )
+                    
+                # Handle completion events
+                elif chunk_type == _TYPE_STOP:
+                    yield DoneEvent(content_parts=content_parts)
+    
+    async def _read_titan_stream(self, body_stream: Iterable[Any]) -> AsyncGenerator[StreamEvent, None]:
+        """Convert a Titan response stream into stream events."""
+        content_parts: List[str] = []
+        
+        async for event in _iterate_in_thread(body_stream):
+            if "chunk" in event:
+                chunk_data = _json.loads(event["chunk"]["bytes"])
+                
+                if "outputText" in chunk_data:
+                    text = chunk_data["outputText"]
+                    content_parts.append(text)
+                    yield ContentChunkEvent(content=text)
+                    
+        # Yield final event when stream is complete
+        yield DoneEvent(content_parts=content_parts)
+    
+    def _unsupported_provider(self, *args: Any) -> Any:
+        """Stand-in handler for model providers without request formatting."""
+        raise ValueError(f"Unsupported model provider: {self.provider}")
+    
     def _format_anthropic_request(
         self, 
         messages: List[Dict[str, Any]], 
@@ -156,18 +332,20 @@ class BedrockModel(ModelBase):
     ) -> Dict[str, Any]:
         """Format request for Claude models."""
         
-        # Extract system message if present
+        # Extract system message if present; the last one wins
         system = None
-        formatted_messages = []
-        
         for msg in messages:
             if msg["role"] == "system":
                 system = msg["content"]
-            else:
-                formatted_messages.append({
-                    "role": "user" if msg["role"] == "user" else "assistant",
-                    "content": msg["content"]
-                })
+        
+        formatted_messages = [
+            {
+                "role": "user" if msg["role"] == "user" else "assistant",
+                "content": msg["content"]
+            }
+            for msg in messages
+            if msg["role"] != "system"
+        ]
         
         request = {
             "anthropic_version": "bedrock-2023-05-31",
@@ -195,14 +373,10 @@ class BedrockModel(ModelBase):
     ) -> Dict[str, Any]:
         """Format request for Amazon Titan models."""
         
-        # Combine messages into a formatted prompt
-        prompt = ""
-        for msg in messages:
-            role = msg["role"].capitalize()
-            content = msg["content"]
-            prompt += f"{role}: {content}\n"
-        
-        prompt += "Assistant: "
+        # Combine messages into a formatted prompt in a single join
+        prompt = "".join(
+            f"{msg['role'].capitalize()}: {msg['content']}\n" for msg in messages
+        ) + "Assistant: "
         
         request = {
             "inputText": prompt,
@@ -219,33 +393,31 @@ class BedrockModel(ModelBase):
         
         return request
     
-    def _parse_response(self, response_body: Dict[str, Any]) -> ModelResponse:
-        """Parse response from different model providers."""
+    def _parse_anthropic_response(self, response_body: Dict[str, Any]) -> ModelResponse:
+        """Parse a response from Claude models."""
         
-        if self.provider == "anthropic":
-            content = response_body.get("content", [{}])[0].get("text", "")
-            tool_calls = []
-            
-            # Extract tool calls if present
-            if "tool_use" in response_body:
-                tool_uses = response_body.get("tool_use", [])
-                for i, tool_use in enumerate(tool_uses):
-                    tool_calls.append({
-                        "id": f"call_{i}",
-                        "type": "function",
-                        "function": {
-                            "name": tool_use.get("name", ""),
-                            "arguments": tool_use.get("input", {})
-                        }
-                    })
-                    
-            return ModelResponse(content=content, tool_calls=tool_calls)
-            
-        elif self.provider == "amazon":
-            return ModelResponse(
-                content=response_body.get("results", [{}])[0].get("outputText", ""),
-                tool_calls=[]  # Titan has limited tool support as of now
-            )
-            
-        else:
-            raise ValueError(f"Unsupported model provider: {self.provider}")
\ No newline at end of file
+        content = response_body.get("content", [{}])[0].get("text", "")
+        tool_calls = []
+        
+        # Extract tool calls if present
+        if "tool_use" in response_body:
+            tool_uses = response_body.get("tool_use", [])
+            for i, tool_use in enumerate(tool_uses):
+                tool_calls.append({
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {
+                        "name": tool_use.get("name", ""),
+                        "arguments": tool_use.get("input", {})
+                    }
+                })
+                
+        return ModelResponse.model_construct(content=content, tool_calls=tool_calls)
+    
+    def _parse_titan_response(self, response_body: Dict[str, Any]) -> ModelResponse:
+        """Parse a response from Amazon Titan models."""
+        
+        return ModelResponse.model_construct(
+            content=response_body.get("results", [{}])[0].get("outputText", ""),
+            tool_calls=[]  # Titan has limited tool support as of now
+        )
@@ -1,13 +1,184 @@
-import json
-from typing import Any, AsyncGenerator, Dict, List, Optional, Union
+import asyncio
+import contextlib
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
 
+import httpx
 from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
 
+from .. import _json
 from .base import ModelBase, ModelResponse
+from ..client import get_shared_client
 from ..stream import StreamEvent, ContentChunkEvent, ToolCallEvent, DoneEvent, ErrorEvent
 
 
+T = TypeVar("T")
+
+# How many stream chunks to read ahead of the consumer
+_PREFETCH_CHUNKS = 16
+
+# Marks the end of a prefetched stream
+_STREAM_END = object()
+
+# One tool call fragment: index, id, function name, arguments fragment
+_ToolCallDelta = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+# One streamed chunk: content, tool call fragments, finish reason
+_StreamDelta = Tuple[Optional[str], Optional[List[_ToolCallDelta]], Optional[str]]
+
+
+@dataclass(slots=True)
+class _ToolCallState:
+    """A tool call being assembled from stream deltas."""
+    
+    id: Optional[str] = None
+    name_parts: List[str] = field(default_factory=list)
+    arguments_parts: List[str] = field(default_factory=list)
+
+
+def _tool_call_events(tool_calls_buffer: List[_ToolCallState]) -> Iterator[StreamEvent]:
+    """Turn fully streamed tool calls into events and clear the buffer.
+    
+    Args:
+        tool_calls_buffer: Accumulated tool calls, indexed by their stream index.
+        
+    Returns:
+        A ToolCallEvent per call, or an ErrorEvent if its arguments are not
+        valid JSON.
+    """
+    for index, tool_call in enumerate(tool_calls_buffer):
+        if not tool_call.name_parts and not tool_call.arguments_parts:
+            # Placeholder for an index the stream skipped
+            continue
+        
+        name = "".join(tool_call.name_parts)
+        raw_args = "".join(tool_call.arguments_parts) or "{}"
+        
+        try:
+            args = _json.loads(raw_args)
+        except _json.JSONDecodeError as e:
+            yield ErrorEvent(message=f"Invalid arguments for tool '{name}': {e}")
+            continue
+        
+        yield ToolCallEvent(
+            tool_name=name,
+            tool_id=tool_call.id or f"call_{index}",
+            arguments=args,
+            arguments_raw=raw_args
+        )
+    
+    tool_calls_buffer.clear()
+
+
+async def _prefetch(source: AsyncIterator[T], maxsize: int = _PREFETCH_CHUNKS) -> AsyncGenerator[T, None]:
+    """Read ahead from source in a background task.
+    
+    The next chunks are received and parsed while the consumer is still
+    handling earlier ones, up to maxsize chunks ahead.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    error: Optional[BaseException] = None
+    
+    async def reader() -> None:
+        nonlocal error
+        try:
+            async for item in source:
+                await queue.put(item)
+        except Exception as e:
+            error = e
+        await queue.put(_STREAM_END)
+    
+    reader_task = asyncio.ensure_future(reader())
+    
+    try:
+        while True:
+            item = await queue.get()
+            if item is _STREAM_END:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # Stop reading if the consumer goes away early
+        reader_task.cancel()
+        await asyncio.wait([reader_task])
+
+
+async def _sdk_deltas(stream: AsyncIterator[Any]) -> AsyncGenerator[_StreamDelta, None]:
+    """Read stream deltas from the SDK's parsed chunk objects."""
+    async for chunk in stream:
+        choice = chunk.choices[0]
+        delta = choice.delta
+        fragments: Optional[List[_ToolCallDelta]] = None
+        
+        if delta.tool_calls:
+            fragments = [
+                (tc.index, tc.id, tc.function and tc.function.name, tc.function and tc.function.arguments)
+                for tc in delta.tool_calls
+            ]
+        
+        yield delta.content, fragments, choice.finish_reason
+
+
+async def _sse_data(byte_stream: AsyncIterator[bytes]) -> AsyncGenerator[bytes, None]:
+    """Split a server-sent event byte stream into its data payloads.
+    
+    Network reads are appended to one reusable buffer and only complete data
+    lines are copied out, rather than building a new bytes object per read.
+    """
+    buffer: bytearray = bytearray()
+    
+    async for data in byte_stream:
+        buffer += data
+        start: int = 0
+        
+        while True:
+            end: int = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            
+            if buffer.startswith(b"data:", start):
+                payload = buffer[start + 5:end].strip()
+                if payload == b"[DONE]":
+                    return
+                if payload:
+                    yield payload
+            
+            start = end + 1
+        
+        # Drop the consumed lines, keeping any partial line for the next read
+        del buffer[:start]
+
+
+async def _raw_deltas(response: Any) -> AsyncGenerator[_StreamDelta, None]:
+    """Read stream deltas straight from the raw SSE response body."""
+    async for payload in _sse_data(response.iter_bytes()):
+        chunk: Dict[str, Any] = _json.loads(payload)
+        
+        error = chunk.get("error")
+        if error is not None:
+            raise RuntimeError(error.get("message", error) if isinstance(error, dict) else error)
+        
+        choices = chunk.get("choices")
+        if not choices:
+            # Usage-only chunks carry no choices
+            continue
+        
+        choice: Dict[str, Any] = choices[0]
+        delta: Dict[str, Any] = choice.get("delta") or {}
+        fragments: Optional[List[_ToolCallDelta]] = None
+        
+        if delta.get("tool_calls"):
+            fragments = [
+                (tc["index"], tc.get("id"), fn.get("name"), fn.get("arguments"))
+                for tc in delta["tool_calls"]
+                for fn in (tc.get("function") or {},)
+            ]
+        
+        yield delta.get("content"), fragments, choice.get("finish_reason")
+
+
 class OpenAIModel(ModelBase):
     """OpenAI model provider implementation."""
     
@@ -17,6 +188,8 @@ class OpenAIModel(ModelBase):
         api_key: Optional[str] = None,
         organization: Optional[str] = None,
         base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        raw_stream: bool = False,
     ):
         """Initialize the OpenAI model.
         
@@ -25,14 +198,51 @@ class OpenAIModel(ModelBase):
             api_key: Optional API key (will use env var if not provided).
             organization: Optional organization ID.
             base_url: Optional base URL for the API.
+            http_client: Optional HTTP client. Defaults to the shared client
+                from get_shared_client() for the running event loop so
+                connections are reused.
+            raw_stream: Parse the server-sent event stream directly instead of
+                through the SDK's per-chunk models. Faster for long responses,
+                but skips the SDK's validation of each chunk.
         """
         self.model = model
+        
+        # Request arguments that are the same for every call
+        self._base_kwargs: Dict[str, Any] = {"model": model}
+        self._stream_kwargs: Dict[str, Any] = {"model": model, "stream": True}
+        self.raw_stream: bool = raw_stream
+        
+        shared_http_client = None if http_client else get_shared_client()
         self.client = AsyncOpenAI(
             api_key=api_key,
             organization=organization,
-            base_url=base_url
+            base_url=base_url,
+            http_client=http_client or shared_http_client,
         )
         
+        # Client to copy per event loop; clients passed in are used as they are
+        self._shared_client: Optional[AsyncOpenAI] = None if http_client else self.client
+        # Shared HTTP client of the last loop used, and the client bound to it
+        self._loop_client: Tuple[Optional[httpx.AsyncClient], AsyncOpenAI] = (shared_http_client, self.client)
+    
+    def _client_for_loop(self) -> AsyncOpenAI:
+        """Get the SDK client for the running event loop.
+        
+        Pooled connections cannot move between loops, so unless a client was
+        passed in or assigned, requests go through a copy of self.client bound
+        to the running loop's shared HTTP client.
+        """
+        client = self.client
+        if client is not self._shared_client:
+            return client
+        
+        http_client = get_shared_client()
+        loop_http_client, loop_client = self._loop_client
+        if loop_http_client is not http_client:
+            loop_client = client.copy(http_client=http_client)
+            self._loop_client = (http_client, loop_client)
+        return loop_client
+        
     async def generate(
         self,
         messages: List[Dict[str, Any]],
@@ -42,25 +252,26 @@ class OpenAIModel(ModelBase):
     ) -> ModelResponse:
         """Generate a response from OpenAI."""
         
-        kwargs = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-        }
+        kwargs: Dict[str, Any] = {**self._base_kwargs, "messages": messages}
         
+        # Leave unset values to the API's defaults
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+            
         if max_tokens is not None:
             kwargs["max_tokens"] = max_tokens
             
         if tools:
             kwargs["tools"] = tools
             
-        response = await self.client.chat.completions.create(**kwargs)
+        response = await self._client_for_loop().chat.completions.create(**kwargs)
         
         # Extract the completion message
         message = response.choices[0].message
         
-        # Parse into our standard format
-        model_response = ModelResponse(
+        # Parse into our standard format; the SDK has already validated the
+        # fields, so skip Pydantic validation
+        model_response = ModelResponse.model_construct(
             content=message.content,
             tool_calls=[
                 {
@@ -68,7 +279,7 @@ class OpenAIModel(ModelBase):
                     "type": "function",
                     "function": {
                         "name": tc.function.name,
-                        "arguments": json.loads(tc.function.arguments)
+                        "arguments": _json.loads(tc.function.arguments)
                     }
                 }
                 for tc in message.tool_calls or []
@@ -86,13 +297,13 @@ class OpenAIModel(ModelBase):
     ) -> AsyncGenerator[StreamEvent, None]:
         """Generate a streaming response from OpenAI."""
         
-        kwargs = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "stream": True,  # Enable streaming
-        }
+        # Enable streaming
+        kwargs: Dict[str, Any] = {**self._stream_kwargs, "messages": messages}
         
+        # Leave unset values to the API's defaults
+        if temperature is not None:
+            kwargs["temperature"] = temperature
+            
         if max_tokens is not None:
             kwargs["max_tokens"] = max_tokens
             
@@ -100,64 +311,69 @@ class OpenAIModel(ModelBase):
             kwargs["tools"] = tools
             
         try:
-            # Get the streaming response
-            stream = await self.client.chat.completions.create(**kwargs)
-            
-            tool_calls_buffer = {}  # Buffer to accumulate tool call chunks
-            content_buffer = ""  # Buffer to accumulate content chunks
-            
-            async for chunk in stream:
-                delta = chunk.choices[0].delta
+            async with contextlib.AsyncExitStack() as stack:
+                # Get the streaming response
+                if self.raw_stream:
+                    response = await stack.enter_async_context(
+                        self._client_for_loop().chat.completions.with_streaming_response.create(**kwargs)
+                    )
+                    deltas = _raw_deltas(response)
+                else:
+                    stream = await self._client_for_loop().chat.completions.create(**kwargs)
+                    deltas = _sdk_deltas(stream)
                 
-                # Process content chunks
-                if delta.content:
-                    content_buffer += delta.content
-                    yield ContentChunkEvent(content=delta.content)
+                # Overlap receiving the next chunks with handling this one
+                prefetched = _prefetch(deltas)
+                stack.push_async_callback(prefetched.aclose)
                 
-                # Process tool calls
-                if delta.tool_calls:
-                    for tc_delta in delta.tool_calls:
-                        tc_id = tc_delta.id or tc_delta.index
-                        
-                        # Initialize the tool call in the buffer if it's new
-                        if tc_id not in tool_calls_buffer:
-                            tool_calls_buffer[tc_id] = {
-                                "id": tc_id,
-                                "type": "function",
-                                "function": {
-                                    "name": "",
-                                    "arguments": ""
-                                }
-                            }
-                        
-                        # Update the tool call data with this chunk
-                        if tc_delta.function.name:
-                            tool_calls_buffer[tc_id]["function"]["name"] = tc_delta.function.name
-                            
-                        if tc_delta.function.arguments:
-                            tool_calls_buffer[tc_id]["function"]["arguments"] += tc_delta.function.arguments
-                            
-                        # If we have a complete tool call, emit an event
-                        if (chunk.choices[0].finish_reason == "tool_calls" and
-                            tool_calls_buffer[tc_id]["function"]["name"] and
-                            tool_calls_buffer[tc_id]["function"]["arguments"]):
-                            
-                            try:
-                                args = json.loads(tool_calls_buffer[tc_id]["function"]["arguments"])
-                                
-                                yield ToolCallEvent(
-                                    tool_name=tool_calls_buffer[tc_id]["function"]["name"],
-                                    tool_id=tc_id,
-                                    arguments=args
-                                )
-                            except json.JSONDecodeError:
-                                # Arguments might be incomplete JSON
-                                pass
-            
-            # Yield final event when stream is complete
-            yield DoneEvent(final_content=content_buffer)
+                async for event in self._read_deltas(prefetched):
+                    yield event
             
         except Exception as e:
             yield ErrorEvent(message=f"Error during streaming: {str(e)}")
             # Yield a done event to signal the end of the stream
-            yield DoneEvent(final_content=None)
\ No newline at end of file
+            yield DoneEvent(final_content=None)
+    
+    async def _read_deltas(self, deltas: AsyncIterator[_StreamDelta]) -> AsyncGenerator[StreamEvent, None]:
+        """Turn stream deltas into content, tool call and done events."""
+        # Tool calls being assembled, by their stream index
+        tool_calls_buffer: List[_ToolCallState] = []
+        content_parts: List[str] = []  # Content chunks, joined once at the end
+        
+        async for content, tool_call_deltas, finish_reason in deltas:
+            # Process content chunks
+            if content:
+                content_parts.append(content)
+                yield ContentChunkEvent(content=content)
+            
+            # Process tool calls; only the first delta of each call carries
+            # its id, so calls are tracked by their index
+            if tool_call_deltas:
+                for index, tc_id, fn_name, fn_args in tool_call_deltas:
+                    # Indices are small and dense, so grow the list to fit
+                    while index >= len(tool_calls_buffer):
+                        tool_calls_buffer.append(_ToolCallState())
+                    tool_call = tool_calls_buffer[index]
+                    
+                    # Update the tool call data with this chunk
+                    if tc_id:
+                        tool_call.id = tc_id
+                        
+                    if fn_name:
+                        tool_call.name_parts.append(fn_name)
+                        
+                    if fn_args:
+                        tool_call.arguments_parts.append(fn_args)
+            
+            # The arguments are complete once the model stops for tool calls,
+            # so each call's JSON is parsed exactly once
+            if finish_reason == "tool_calls":
+                for event in _tool_call_events(tool_calls_buffer):
+                    yield event
+        
+        # Some servers finish with a different reason, so emit any leftovers
+        for event in _tool_call_events(tool_calls_buffer):
+            yield event
+        
+        # Yield final event when stream is complete
+        yield DoneEvent(content_parts=content_parts)
\ No newline at end of file
@@ -1,15 +1,18 @@
 """
 Stream event definitions for the simple agent framework.
+
+Events are emitted once per streamed chunk, so they are plain slotted
+dataclasses rather than Pydantic models to keep validation off the hot path.
 """
 
-from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, fields
+from enum import Enum, IntEnum
+from typing import Any, ClassVar, Dict, Iterable, Optional, Tuple, Union
 
 
 class EventType(str, Enum):
     """Types of stream events."""
-    
+
     CONTENT_CHUNK = "content_chunk"
     TOOL_CALL = "tool_call"
     TOOL_RESULT = "tool_result"
@@ -17,46 +20,117 @@ class EventType(str, Enum):
     DONE = "done"
 
 
-class StreamEvent(BaseModel):
+class EventKind(IntEnum):
+    """Dense integer tags for stream events, for table-based dispatch."""
+
+    CONTENT_CHUNK = 0
+    TOOL_CALL = 1
+    TOOL_RESULT = 2
+    ERROR = 3
+    DONE = 4
+
+
+@dataclass(slots=True, frozen=True)
+class StreamEvent:
     """Base class for all stream events."""
-    
-    type: EventType
-    
 
+    type: ClassVar[EventType]
+    kind: ClassVar[EventKind]
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Convert the event to a dict, as the former Pydantic events did.
+
+        Returns:
+            The event's fields, including its type.
+        """
+        # Shallow, like Pydantic's: field values are returned as they are
+        # rather than deep-copied, so any tool result can be dumped
+        return {"type": self.type, **{f.name: getattr(self, f.name) for f in fields(self)}}
+
+
+@dataclass(slots=True, frozen=True)
 class ContentChunkEvent(StreamEvent):
     """Event for a chunk of content from the model."""
-    
-    type: EventType = EventType.CONTENT_CHUNK
+
+    type: ClassVar[EventType] = EventType.CONTENT_CHUNK
+    kind: ClassVar[EventKind] = EventKind.CONTENT_CHUNK
     content: str
-    
 
+
+@dataclass(slots=True, frozen=True)
 class ToolCallEvent(StreamEvent):
     """Event for a tool call from the model."""
-    
-    type: EventType = EventType.TOOL_CALL
+
+    type: ClassVar[EventType] = EventType.TOOL_CALL
+    kind: ClassVar[EventKind] = EventKind.TOOL_CALL
     tool_name: str
     tool_id: str
     arguments: Dict[str, Any]
-    
+    # Arguments exactly as the model sent them, when available
+    arguments_raw: Optional[str] = None
+
 
+@dataclass(slots=True, frozen=True)
 class ToolResultEvent(StreamEvent):
     """Event for a tool execution result."""
-    
-    type: EventType = EventType.TOOL_RESULT
+
+    type: ClassVar[EventType] = EventType.TOOL_RESULT
+    kind: ClassVar[EventKind] = EventKind.TOOL_RESULT
     tool_name: str
     tool_id: str
     result: Any
-    
 
+
+@dataclass(slots=True, frozen=True)
 class ErrorEvent(StreamEvent):
     """Event for an error during streaming."""
-    
-    type: EventType = EventType.ERROR
+
+    type: ClassVar[EventType] = EventType.ERROR
+    kind: ClassVar[EventKind] = EventKind.ERROR
     message: str
-    
 
+
+@dataclass(slots=True, frozen=True, init=False, repr=False, eq=False)
 class DoneEvent(StreamEvent):
-    """Event indicating the stream is complete."""
-    
-    type: EventType = EventType.DONE
-    final_content: Optional[str] = None
\ No newline at end of file
+    """Event indicating the stream is complete.
+
+    Providers may pass the streamed content as content_parts instead of
+    final_content; the parts are only joined if final_content is read.
+    """
+
+    type: ClassVar[EventType] = EventType.DONE
+    kind: ClassVar[EventKind] = EventKind.DONE
+    # The final content, or its parts until they are first joined
+    _content: Union[str, Tuple[str, ...], None]
+
+    def __init__(
+        self,
+        final_content: Optional[str] = None,
+        content_parts: Optional[Iterable[str]] = None,
+    ):
+        content = tuple(content_parts) if content_parts is not None else final_content
+        object.__setattr__(self, "_content", content)
+
+    @property
+    def final_content(self) -> Optional[str]:
+        """The complete streamed content, joined on first access."""
+        content = self._content
+        if isinstance(content, tuple):
+            content = "".join(content)
+            object.__setattr__(self, "_content", content)
+        return content
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Convert the event to a dict, as the former Pydantic events did."""
+        return {"type": self.type, "final_content": self.final_content}
+
+    def __repr__(self) -> str:
+        return f"DoneEvent(final_content={self.final_content!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DoneEvent):
+            return NotImplemented
+        return self.final_content == other.final_content
+
+    def __hash__(self) -> int:
+        return hash(self.final_content)
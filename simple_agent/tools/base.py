@@ -1,12 +1,28 @@
+import asyncio
 import inspect
 import json
+import re
 from enum import Enum
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Type, Union, get_type_hints
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Type, Union, get_origin, get_type_hints
 
 from pydantic import BaseModel, create_model
 
-from pydantic.json_schema import JsonSchemaMode, model_json_schema
+
+# A "name: description" line in a docstring
+_PARAM_DOC_RE = re.compile(r"(\w+):\s*(.*)")
+
+# JSON schema types for Python types; anything else is described as a string
+_PY_TO_JSON_TYPE = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    List: "array",
+    dict: "object",
+    Dict: "object",
+}
 
 
 class ToolType(str, Enum):
@@ -18,46 +34,92 @@ class ToolType(str, Enum):
 class Tool:
     """Base class for tools that can be used by agents."""
     
+    __slots__ = (
+        "name",
+        "description",
+        "function",
+        "parameters_schema",
+        "run_in_thread",
+        "_is_coro",
+        "_schema_dict",
+    )
+    
     def __init__(
         self,
         name: str,
         description: str,
         function: Callable,
         parameters_schema: Dict[str, Any],
+        run_in_thread: bool = False,
     ):
         self.name = name
         self.description = description
         self.function = function
         self.parameters_schema = parameters_schema
+        # Run a blocking sync function in a worker thread, off the event loop
+        self.run_in_thread = run_in_thread
+        self._is_coro = inspect.iscoroutinefunction(function)
         
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert tool to a dictionary format compatible with model APIs."""
-        return {
-            "type": ToolType.FUNCTION,
+        # Built once, since the definition is sent with every model call
+        self._schema_dict = {
+            "type": ToolType.FUNCTION.value,
             "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": self.parameters_schema,
+                "name": name,
+                "description": description,
+                "parameters": parameters_schema,
             }
         }
         
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert tool to a dictionary format compatible with model APIs.
+        
+        The same dict is returned on every call, so callers must not modify it.
+        """
+        return self._schema_dict
+        
     async def execute(self, **kwargs) -> Any:
         """Execute the tool with the given arguments."""
-        if inspect.iscoroutinefunction(self.function):
+        if self._is_coro:
             return await self.function(**kwargs)
+        if self.run_in_thread:
+            return await asyncio.to_thread(self.function, **kwargs)
         return self.function(**kwargs)
 
 
+@lru_cache(maxsize=None)
+def _type_hints(func: Callable) -> Dict[str, Any]:
+    """Get a function's resolved type hints, cached per function.
+    
+    The returned dict is shared, so callers must not modify it.
+    """
+    return get_type_hints(func)
+
+
+@lru_cache(maxsize=None)
+def _signature(func: Callable) -> inspect.Signature:
+    """Get a function's signature, cached per function."""
+    return inspect.signature(func)
+
+
+@lru_cache(maxsize=None)
+def _model_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Get a Pydantic model's JSON schema, generated once per model.
+    
+    The returned dict is shared, so callers must not modify it.
+    """
+    return model.model_json_schema(mode="validation")
+
+
 def _get_param_schema(func: Callable) -> Dict[str, Any]:
     """Extract parameter schema from a function's type hints."""
-    hints = get_type_hints(func)
-    
-    # Remove return type from hints
-    if "return" in hints:
-        del hints["return"]
+    # Only parameters are looked up, so the return hint needs no special case
+    hints = _type_hints(func)
     
     # Get function signature
-    sig = inspect.signature(func)
+    sig = _signature(func)
+    
+    # Read parameter descriptions from the docstring in one pass
+    param_docs = _parse_param_docs(func.__doc__) if func.__doc__ else {}
     
     # Build field info
     properties = {}
@@ -74,10 +136,9 @@ def _get_param_schema(func: Callable) -> Dict[str, Any]:
         }
         
         # Add description from docstring if available
-        if func.__doc__:
-            param_doc = _extract_param_doc(func.__doc__, name)
-            if param_doc:
-                field_info["description"] = param_doc
+        param_doc = param_docs.get(name)
+        if param_doc:
+            field_info["description"] = param_doc
                 
         properties[name] = field_info
         
@@ -96,35 +157,34 @@ def _get_param_schema(func: Callable) -> Dict[str, Any]:
     return schema
 
 
-def _extract_param_doc(docstring: str, param_name: str) -> Optional[str]:
-    """Extract parameter documentation from function docstring."""
-    lines = docstring.split("\n")
-    for i, line in enumerate(lines):
-        if line.strip().startswith(f"{param_name}:"):
-            return line.strip().split(":", 1)[1].strip()
-    return None
+def _parse_param_docs(docstring: str) -> Dict[str, str]:
+    """Extract parameter documentation from function docstring.
+    
+    Returns:
+        The description after each "name:" line, keyed by name. If a name
+        appears more than once, the first line wins.
+    """
+    param_docs = {}
+    for line in docstring.splitlines():
+        match = _PARAM_DOC_RE.match(line.strip())
+        if match:
+            param_docs.setdefault(match.group(1), match.group(2).strip())
+    return param_docs
 
 
 def _python_type_to_json_type(py_type: Type) -> str:
     """Map Python types to JSON schema types."""
-    if py_type == str:
-        return "string"
-    elif py_type == int:
-        return "integer"
-    elif py_type == float:
-        return "number"
-    elif py_type == bool:
-        return "boolean"
-    elif py_type == list or py_type == List:
-        return "array"
-    elif py_type == dict or py_type == Dict:
-        return "object"
-    else:
-        return "string"  # Default to string for complex types
-
-
-def function_tool(func=None, *, name=None, description=None):
-    """Decorator to convert a function into a tool."""
+    # Parameterized generics such as List[int] map by their origin type
+    return _PY_TO_JSON_TYPE.get(get_origin(py_type) or py_type, "string")
+
+
+def function_tool(func=None, *, name=None, description=None, run_in_thread=False):
+    """Decorator to convert a function into a tool.
+    
+    Set run_in_thread for blocking sync functions (file or network I/O,
+    heavy computation) so they run in a worker thread instead of stalling
+    the event loop.
+    """
     
     def decorator(f):
         tool_name = name or f.__name__
@@ -143,6 +203,7 @@ def function_tool(func=None, *, name=None, description=None):
             description=tool_description,
             function=f,
             parameters_schema=param_schema,
+            run_in_thread=run_in_thread,
         )
         
         return wrapper
@@ -152,8 +213,11 @@ def function_tool(func=None, *, name=None, description=None):
     return decorator(func)
 
 
-def pydantic_tool(func=None, *, input_model: Type[BaseModel] = None, name=None, description=None):
-    """Create a tool from a function with a Pydantic model as input."""
+def pydantic_tool(func=None, *, input_model: Type[BaseModel] = None, name=None, description=None, run_in_thread=False):
+    """Create a tool from a function with a Pydantic model as input.
+    
+    run_in_thread works as in function_tool.
+    """
     
     def decorator(f):
         tool_name = name or f.__name__
@@ -161,8 +225,8 @@ def pydantic_tool(func=None, *, input_model: Type[BaseModel] = None, name=None,
         
         if input_model is None:
             # Infer input model from function signature
-            hints = get_type_hints(f)
-            sig = inspect.signature(f)
+            hints = _type_hints(f)
+            sig = _signature(f)
             
             fields = {}
             for param_name, param in sig.parameters.items():
@@ -177,10 +241,7 @@ def pydantic_tool(func=None, *, input_model: Type[BaseModel] = None, name=None,
             param_model = input_model
             
         # Get JSON schema for the Pydantic model
-        schema = model_json_schema(
-            param_model,
-            mode=JsonSchemaMode.OPENAPI_3_1
-        )
+        schema = _model_schema(param_model)
         
         @wraps(f)
         def wrapper(*args, **kwargs):
@@ -192,6 +253,7 @@ def pydantic_tool(func=None, *, input_model: Type[BaseModel] = None, name=None,
             description=tool_description,
             function=f,
             parameters_schema=schema,
+            run_in_thread=run_in_thread,
         )
         
         return wrapper
@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from simple_agent import Agent, AgentConfig, ModelBase
+from simple_agent.stream import ContentChunkEvent, DoneEvent
+
+
+class StreamingModel(ModelBase):
+    """Model that streams the given chunks, pausing where a delay is given."""
+
+    def __init__(self, chunks, delays=None):
+        self.chunks = chunks
+        self.delays = delays or {}
+
+    async def generate(self, messages, tools=None, temperature=0.7, max_tokens=None):
+        raise NotImplementedError
+
+    async def generate_stream(self, messages, tools=None, temperature=0.7, max_tokens=None):
+        for index, chunk in enumerate(self.chunks):
+            if index in self.delays:
+                await asyncio.sleep(self.delays[index])
+            yield ContentChunkEvent(content=chunk)
+        yield DoneEvent(final_content="".join(self.chunks))
+
+
+def _agent(model, **config):
+    return Agent(name="test", instructions="Test", model=model, config=AgentConfig(**config))
+
+
+def test_held_chunks_are_flushed_when_the_stream_stalls():
+    model = StreamingModel(["Hello", " world", "!"], delays={2: 0.5})
+    agent = _agent(model, stream_chunk_batch=8, stream_flush_interval_ms=20.0)
+
+    async def collect():
+        start = time.monotonic()
+        return [(time.monotonic() - start, event) async for event in agent.astream("hi")]
+
+    events = asyncio.run(collect())
+
+    first_at, first = events[0]
+    assert first == ContentChunkEvent(content="Hello world")
+    assert first_at < 0.25
+    assert events[1][1] == ContentChunkEvent(content="!")
+    assert events[-1][1] == DoneEvent(final_content="Hello world!")
+
+
+def test_flush_interval_adds_no_per_chunk_work_to_a_steady_stream():
+    chunk_count = 10_000
+    model = StreamingModel(["x"] * chunk_count)
+    agent = _agent(model, stream_chunk_batch=8, stream_flush_interval_ms=60_000.0)
+
+    loop = asyncio.new_event_loop()
+    timers = 0
+    tasks = 0
+    call_later = loop.call_later
+
+    def counting_call_later(*args, **kwargs):
+        nonlocal timers
+        timers += 1
+        return call_later(*args, **kwargs)
+
+    def counting_task_factory(loop, coro, **kwargs):
+        nonlocal tasks
+        tasks += 1
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.call_later = counting_call_later
+    loop.set_task_factory(counting_task_factory)
+
+    async def collect():
+        return [event async for event in agent.astream("hi")]
+
+    try:
+        events = loop.run_until_complete(collect())
+    finally:
+        loop.close()
+
+    chunks = [event for event in events if isinstance(event, ContentChunkEvent)]
+    assert len(chunks) == chunk_count // 8
+    assert "".join(chunk.content for chunk in chunks) == "x" * chunk_count
+    # One reader task and one armed deadline for the whole stream
+    assert tasks <= 2
+    assert timers <= 1
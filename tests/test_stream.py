@@ -0,0 +1,48 @@
+import threading
+from dataclasses import dataclass
+
+from simple_agent.stream import ContentChunkEvent, DoneEvent, EventType, ToolCallEvent, ToolResultEvent
+
+
+class Client:
+    """A tool result that cannot be copied."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+
+@dataclass
+class Weather:
+    city: str
+
+
+def test_model_dump_includes_type_and_fields():
+    assert ContentChunkEvent(content="hi").model_dump() == {
+        "type": EventType.CONTENT_CHUNK,
+        "content": "hi",
+    }
+    assert DoneEvent(content_parts=["a", "b"]).model_dump() == {
+        "type": EventType.DONE,
+        "final_content": "ab",
+    }
+
+
+def test_model_dump_does_not_copy_field_values():
+    client = Client()
+    event = ToolResultEvent(tool_name="connect", tool_id="call_0", result=client)
+
+    assert event.model_dump()["result"] is client
+
+
+def test_model_dump_keeps_dataclass_results():
+    weather = Weather(city="Paris")
+    event = ToolResultEvent(tool_name="weather", tool_id="call_0", result=weather)
+
+    assert event.model_dump()["result"] is weather
+
+
+def test_model_dump_keeps_tool_arguments():
+    arguments = {"city": "Paris"}
+    event = ToolCallEvent(tool_name="weather", tool_id="call_0", arguments=arguments)
+
+    assert event.model_dump()["arguments"] == arguments